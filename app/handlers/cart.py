@@ -5,18 +5,14 @@ from aiogram.fsm.context import FSMContext
 from app.filters.callback_data import CartItemCallback
 from app.keyboards.cart_kb import get_cart_keyboard, get_empty_cart_keyboard
 from app.services.cart_service import CartService
-from app.i18n import get_text, DEFAULT_LANGUAGE
+from app.services.menu_service import MenuService
+from app.models.money import format_money
+from app.i18n import get_text
 from config import settings
 
 router = Router(name="cart")
 
 
-async def get_user_lang(state: FSMContext) -> str:
-    """Get user language from state"""
-    data = await state.get_data()
-    return data.get("lang", DEFAULT_LANGUAGE)
-
-
 def format_cart_text(cart, lang: str = "en", currency: str = "€") -> str:
     """Format cart for display"""
     if cart.is_empty:
@@ -26,27 +22,30 @@ def format_cart_text(cart, lang: str = "en", currency: str = "€") -> str:
 
     for i, (item_id, item) in enumerate(cart.items.items(), 1):
         lines.append(
-            f"{i}. {item.name} x{item.quantity} — {item.subtotal}{currency}"
+            f"{i}. {item.name} x{item.quantity} — {format_money(item.subtotal)}{currency}"
         )
 
-    lines.append(f"\n<b>{get_text('total', lang)}: {cart.total}{currency}</b>")
+    lines.append(f"\n<b>{get_text('total', lang)}: {format_money(cart.total)}{currency}</b>")
 
     # Check minimum order
     if cart.total < settings.min_order_amount:
         diff = settings.min_order_amount - cart.total
         lines.append(
-            f"\n\n⚠️ {get_text('min_order_warning', lang, min_order=settings.min_order_amount, currency=currency)}"
+            f"\n\n⚠️ {get_text('min_order_warning', lang, min_order=format_money(settings.min_order_amount), currency=currency)}"
         )
-        lines.append(get_text("add_more", lang, amount=diff, currency=currency))
+        lines.append(get_text("add_more", lang, amount=format_money(diff), currency=currency))
 
     return "\n".join(lines)
 
 
 @router.callback_query(F.data == "show_cart")
-async def show_cart(callback: CallbackQuery, state: FSMContext):
+async def show_cart(
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Show cart contents"""
-    lang = await get_user_lang(state)
-    cart = await CartService.get_cart(state, callback.from_user.id)
+    cart = await CartService.get_cart(
+        state, callback.from_user.id, menu_service.get_snapshot(), lang
+    )
 
     text = format_cart_text(cart, lang)
 
@@ -64,22 +63,24 @@ async def cart_item_action(
     callback: CallbackQuery,
     callback_data: CartItemCallback,
     state: FSMContext,
+    menu_service: MenuService,
+    lang: str,
 ):
     """Handle cart item actions (increment, decrement, remove)"""
-    lang = await get_user_lang(state)
     user_id = callback.from_user.id
+    snapshot = menu_service.get_snapshot()
 
     if callback_data.action == "inc":
         cart = await CartService.increment_item(
-            state, user_id, callback_data.item_id
+            state, user_id, snapshot, lang, callback_data.item_id
         )
     elif callback_data.action == "dec":
         cart = await CartService.decrement_item(
-            state, user_id, callback_data.item_id
+            state, user_id, snapshot, lang, callback_data.item_id
         )
     elif callback_data.action == "remove":
         cart = await CartService.remove_item(
-            state, user_id, callback_data.item_id
+            state, user_id, snapshot, lang, callback_data.item_id
         )
     else:
         await callback.answer()
@@ -97,13 +98,17 @@ async def cart_item_action(
 
 
 @router.callback_query(F.data == "clear_cart")
-async def clear_cart(callback: CallbackQuery, state: FSMContext):
+async def clear_cart(
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Clear all items from cart"""
-    lang = await get_user_lang(state)
-    cart = await CartService.clear_cart(state, callback.from_user.id)
+    await CartService.clear_cart(
+        state, callback.from_user.id, menu_service.get_snapshot(), lang
+    )
 
+    # Toast first, before the edit round trip
+    await callback.answer(get_text("cart_cleared_notification", lang))
     await callback.message.edit_text(
         get_text("cart_cleared", lang),
         reply_markup=get_empty_cart_keyboard(lang),
     )
-    await callback.answer(get_text("cart_cleared_notification", lang))
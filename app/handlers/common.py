@@ -6,17 +6,12 @@ from aiogram.exceptions import TelegramBadRequest
 
 from app.keyboards.menu_kb import get_main_menu_keyboard, get_language_keyboard, get_contacts_keyboard
 from app.services.menu_service import MenuService
-from app.i18n import get_text, DEFAULT_LANGUAGE
+from app.models.money import format_money
+from app.i18n import get_text, resolve_language
 
 router = Router(name="common")
 
 
-async def get_user_lang(state: FSMContext) -> str:
-    """Get user language from state"""
-    data = await state.get_data()
-    return data.get("lang", DEFAULT_LANGUAGE)
-
-
 @router.message(CommandStart())
 async def cmd_start(message: Message, state: FSMContext, menu_service: MenuService):
     """Handle /start command - show language selection"""
@@ -35,7 +30,8 @@ async def set_language(
     callback: CallbackQuery, state: FSMContext, menu_service: MenuService
 ):
     """Handle language selection"""
-    lang = callback.data.split(":")[1]
+    # Callback data comes from the client: only known codes are stored
+    lang = resolve_language(callback.data.split(":")[1])
     await state.update_data(lang=lang)
 
     menu = menu_service.get_menu()
@@ -60,9 +56,8 @@ async def set_language(
 
 
 @router.callback_query(F.data == "change_language")
-async def change_language(callback: CallbackQuery, state: FSMContext):
+async def change_language(callback: CallbackQuery, lang: str):
     """Show language selection"""
-    lang = await get_user_lang(state)
     try:
         await callback.message.edit_text(
             get_text("choose_language", lang),
@@ -74,9 +69,8 @@ async def change_language(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(Command("help"))
-async def cmd_help(message: Message, state: FSMContext):
+async def cmd_help(message: Message, lang: str):
     """Handle /help command"""
-    lang = await get_user_lang(state)
     await message.answer(
         get_text("help_text", lang),
         reply_markup=get_main_menu_keyboard(lang),
@@ -84,9 +78,8 @@ async def cmd_help(message: Message, state: FSMContext):
 
 
 @router.message(Command("cancel"))
-async def cmd_cancel(message: Message, state: FSMContext):
+async def cmd_cancel(message: Message, state: FSMContext, lang: str):
     """Handle /cancel command - exit any state"""
-    lang = await get_user_lang(state)
     current_state = await state.get_state()
 
     if current_state is None:
@@ -107,10 +100,9 @@ async def cmd_cancel(message: Message, state: FSMContext):
 
 @router.callback_query(F.data == "main_menu")
 async def back_to_main_menu(
-    callback: CallbackQuery, state: FSMContext, menu_service: MenuService
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
 ):
     """Return to main menu"""
-    lang = await get_user_lang(state)
 
     # Keep language when clearing state
     await state.clear()
@@ -129,9 +121,8 @@ async def back_to_main_menu(
 
 
 @router.callback_query(F.data == "show_help")
-async def show_help(callback: CallbackQuery, state: FSMContext):
+async def show_help(callback: CallbackQuery, lang: str):
     """Show help"""
-    lang = await get_user_lang(state)
     try:
         await callback.message.edit_text(
             get_text("help_text", lang),
@@ -144,10 +135,9 @@ async def show_help(callback: CallbackQuery, state: FSMContext):
 
 @router.callback_query(F.data == "show_contacts")
 async def show_contacts(
-    callback: CallbackQuery, state: FSMContext, menu_service: MenuService
+    callback: CallbackQuery, menu_service: MenuService, lang: str
 ):
     """Show contacts"""
-    lang = await get_user_lang(state)
     menu = menu_service.get_menu()
     restaurant = menu.restaurant
 
@@ -159,7 +149,7 @@ async def show_contacts(
         phone=restaurant.phone,
         instagram=restaurant.instagram,
         hours=restaurant.get_working_hours(lang),
-        min_order=restaurant.min_order_amount,
+        min_order=format_money(restaurant.min_order_amount),
         currency=menu.currency,
     )
 
@@ -1,6 +1,6 @@
 import os
 from aiogram import Router, F
-from aiogram.types import CallbackQuery, FSInputFile, InputMediaPhoto
+from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 from aiogram.exceptions import TelegramBadRequest
 
@@ -17,30 +17,27 @@ from app.keyboards.menu_kb import (
 )
 from app.services.menu_service import MenuService
 from app.services.cart_service import CartService
-from app.i18n import get_text, DEFAULT_LANGUAGE
+from app.services.image_cache_service import ImageCacheService
+from app.services.render_cache import item_texts
+from app.services.edit_coalescer import EditCoalescer
+from app.services.image_optimizer_service import ImageOptimizerService
+from app.i18n import get_text
 
 router = Router(name="menu")
 
 
-async def get_user_lang(state: FSMContext) -> str:
-    """Get user language from state"""
-    data = await state.get_data()
-    return data.get("lang", DEFAULT_LANGUAGE)
-
-
 @router.callback_query(F.data == "show_menu")
 async def show_menu(
-    callback: CallbackQuery, state: FSMContext, menu_service: MenuService
+    callback: CallbackQuery, menu_service: MenuService, lang: str
 ):
     """Show categories"""
-    lang = await get_user_lang(state)
-    menu = menu_service.get_menu()
+    snapshot = menu_service.get_snapshot()
 
     text = get_text("menu_title", lang)
 
     try:
         await callback.message.edit_text(
-            text, reply_markup=get_categories_keyboard(menu, lang)
+            text, reply_markup=get_categories_keyboard(snapshot, lang)
         )
     except TelegramBadRequest:
         pass
@@ -52,23 +49,22 @@ async def show_category_items(
     callback: CallbackQuery,
     callback_data: CategoryCallback,
     state: FSMContext,
-    menu_service: MenuService,
+    menu_service: MenuService, lang: str
 ):
     """Show items in category"""
-    lang = await get_user_lang(state)
-    category = menu_service.get_category(callback_data.category_id)
-    menu = menu_service.get_menu()
+    snapshot = menu_service.get_snapshot()
+    category = snapshot.get_category(callback_data.category_id)
 
     if not category:
         await callback.answer(get_text("category_not_found", lang), show_alert=True)
         return
 
-    cart = await CartService.get_cart(state, callback.from_user.id)
+    cart = await CartService.get_cart(state, callback.from_user.id, snapshot, lang)
 
     text = get_text(
         "category_title", lang, emoji=category.emoji, name=category.get_name(lang)
     )
-    keyboard = get_items_keyboard(category, cart, lang, menu.currency)
+    keyboard = get_items_keyboard(snapshot, category, cart, lang)
 
     # If current message is a photo, delete and send new text message
     if callback.message.photo:
@@ -88,21 +84,24 @@ async def show_item_detail(
     callback_data: ItemCallback,
     state: FSMContext,
     menu_service: MenuService,
+    image_cache: ImageCacheService,
+    image_optimizer: ImageOptimizerService,
+    lang: str,
 ):
     """Show item details"""
-    lang = await get_user_lang(state)
-    item = menu_service.get_item(callback_data.item_id)
-    menu = menu_service.get_menu()
+    snapshot = menu_service.get_snapshot()
+    item = snapshot.get_item(callback_data.item_id)
+    menu = snapshot.menu
 
     if not item:
         await callback.answer(get_text("item_not_found", lang), show_alert=True)
         return
 
-    category = menu_service.get_category_for_item(item.id)
+    category = snapshot.get_category_for_item(item.id)
     category_id = category.id if category else ""
 
     # Get current quantity in cart
-    cart = await CartService.get_cart(state, callback.from_user.id)
+    cart = await CartService.get_cart(state, callback.from_user.id, snapshot, lang)
     current_qty = 1
     if item.id in cart.items:
         current_qty = cart.items[item.id].quantity
@@ -114,18 +113,8 @@ async def show_item_detail(
         viewing_category_id=category_id,
     )
 
-    # Build item description
-    text = get_text(
-        "item_detail",
-        lang,
-        name=item.get_name(lang),
-        description=item.get_description(lang),
-        weight=item.weight,
-        pieces=f" | {item.pieces} {get_text('pcs', lang)}" if item.pieces else "",
-        price=item.price,
-        currency=menu.currency,
-        popular=f"\n\n⭐ {get_text('popular_item', lang)}" if item.popular else "",
-    )
+    # Item description, rendered once per menu revision
+    text = item_texts.item_detail(snapshot, item, lang)
 
     keyboard = get_item_detail_keyboard(
         item, quantity=1, category_id=category_id, lang=lang, currency=menu.currency
@@ -138,9 +127,9 @@ async def show_item_detail(
             await callback.message.delete()
         except TelegramBadRequest:
             pass
-        photo = FSInputFile(item.image)
-        await callback.message.answer_photo(
-            photo=photo,
+        await image_cache.answer_photo(
+            callback.message,
+            image_optimizer.get_variant(item.image),
             caption=text,
             reply_markup=keyboard,
         )
@@ -158,11 +147,13 @@ async def change_quantity(
     callback_data: QuantityCallback,
     state: FSMContext,
     menu_service: MenuService,
+    edit_coalescer: EditCoalescer,
+    lang: str,
 ):
     """Handle quantity change"""
-    lang = await get_user_lang(state)
-    item = menu_service.get_item(callback_data.item_id)
-    menu = menu_service.get_menu()
+    snapshot = menu_service.get_snapshot()
+    item = snapshot.get_item(callback_data.item_id)
+    menu = snapshot.menu
 
     if not item:
         await callback.answer(get_text("item_not_found", lang), show_alert=True)
@@ -179,37 +170,23 @@ async def change_quantity(
     else:
         new_qty = max(current_qty - 1, 1)  # Min 1
 
+    # Already at the 1 or 99 limit: nothing to show
+    if new_qty == current_qty:
+        await callback.answer()
+        return
+
     # Update state
     await state.update_data(viewing_item_qty=new_qty)
 
-    # Build item description
-    text = get_text(
-        "item_detail",
-        lang,
-        name=item.get_name(lang),
-        description=item.get_description(lang),
-        weight=item.weight,
-        pieces=f" | {item.pieces} {get_text('pcs', lang)}" if item.pieces else "",
-        price=item.price,
-        currency=menu.currency,
-        popular=f"\n\n⭐ {get_text('popular_item', lang)}" if item.popular else "",
-    )
+    # Item description, rendered once per menu revision
+    text = item_texts.item_detail(snapshot, item, lang)
 
     keyboard = get_item_detail_keyboard(
         item, quantity=new_qty, category_id=category_id, lang=lang, currency=menu.currency
     )
 
-    # Check if current message is a photo (has caption)
-    if callback.message.photo:
-        await callback.message.edit_caption(
-            caption=text,
-            reply_markup=keyboard,
-        )
-    else:
-        await callback.message.edit_text(
-            text,
-            reply_markup=keyboard,
-        )
+    # Fast taps are merged into one edit (caption for photo messages)
+    edit_coalescer.submit(callback.message, text, keyboard)
     await callback.answer()
 
 
@@ -218,12 +195,11 @@ async def add_to_cart(
     callback: CallbackQuery,
     callback_data: AddToCartCallback,
     state: FSMContext,
-    menu_service: MenuService,
+    menu_service: MenuService, lang: str
 ):
     """Add item to cart"""
-    lang = await get_user_lang(state)
-    item = menu_service.get_item(callback_data.item_id)
-    menu = menu_service.get_menu()
+    snapshot = menu_service.get_snapshot()
+    item = snapshot.get_item(callback_data.item_id)
 
     if not item:
         await callback.answer(get_text("item_not_found", lang), show_alert=True)
@@ -235,11 +211,11 @@ async def add_to_cart(
 
     # Add to cart
     cart = await CartService.add_item(
-        state, callback.from_user.id, item, quantity, lang
+        state, callback.from_user.id, snapshot, item, quantity, lang
     )
 
     # Show confirmation and return to category
-    category = menu_service.get_category_for_item(item.id)
+    category = snapshot.get_category_for_item(item.id)
 
     await callback.answer(
         get_text("added_to_cart", lang, name=item.get_name(lang), quantity=quantity),
@@ -250,7 +226,7 @@ async def add_to_cart(
         text = get_text(
             "category_title", lang, emoji=category.emoji, name=category.get_name(lang)
         )
-        keyboard = get_items_keyboard(category, cart, lang, menu.currency)
+        keyboard = get_items_keyboard(snapshot, category, cart, lang)
 
         # If current message is a photo, delete and send new text message
         if callback.message.photo:
@@ -264,7 +240,7 @@ async def add_to_cart(
     else:
         # Fallback to categories
         text = get_text("menu_title", lang)
-        keyboard = get_categories_keyboard(menu, lang)
+        keyboard = get_categories_keyboard(snapshot, lang)
 
         if callback.message.photo:
             try:
@@ -19,22 +19,20 @@ from app.keyboards.order_kb import (
 )
 from app.keyboards.cart_kb import get_cart_keyboard
 from app.services.cart_service import CartService
+from app.services.menu_service import MenuService
 from app.services.sheets_service import GoogleSheetsService
 from app.services.notification_service import NotificationService
+from app.services.order_outbox_service import OrderOutbox
+from app.services.order_id_service import OrderIdAllocator
 from app.models.order import Order, DeliveryType
-from app.i18n import get_text, DEFAULT_LANGUAGE
+from app.models.money import format_money
+from app.i18n import get_text
 from config import settings
 from datetime import datetime
 
 router = Router(name="order")
 
 
-async def get_user_lang(state: FSMContext) -> str:
-    """Get user language from state"""
-    data = await state.get_data()
-    return data.get("lang", DEFAULT_LANGUAGE)
-
-
 def validate_phone(phone: str) -> bool:
     """Validate phone number format"""
     # Remove spaces, dashes, parentheses, dots
@@ -51,6 +49,17 @@ def validate_phone(phone: str) -> bool:
     return False
 
 
+def get_delivery_fee(delivery_type: DeliveryType) -> int:
+    """Delivery fee in cents, always taken from current settings.
+
+    Not kept in FSM data: a fee stored there outlives deploys and
+    changes of the setting (and of its unit).
+    """
+    if delivery_type == DeliveryType.DELIVERY:
+        return settings.delivery_fee
+    return 0
+
+
 def format_order_summary(
     cart,
     customer_name: str,
@@ -82,24 +91,27 @@ def format_order_summary(
     lines.append(f"\n<b>{get_text('order', lang)}:</b>")
 
     for item in cart.items.values():
-        lines.append(f"• {item.name} x{item.quantity} — {item.subtotal}{currency}")
+        lines.append(f"• {item.name} x{item.quantity} — {format_money(item.subtotal)}{currency}")
 
-    lines.append(f"\n{get_text('subtotal', lang)}: {cart.total}{currency}")
+    lines.append(f"\n{get_text('subtotal', lang)}: {format_money(cart.total)}{currency}")
 
     if delivery_fee > 0:
-        lines.append(f"{get_text('delivery_fee', lang)}: {delivery_fee}{currency}")
-        lines.append(f"\n<b>{get_text('total', lang)}: {cart.total + delivery_fee}{currency}</b>")
+        lines.append(f"{get_text('delivery_fee', lang)}: {format_money(delivery_fee)}{currency}")
+        lines.append(f"\n<b>{get_text('total', lang)}: {format_money(cart.total + delivery_fee)}{currency}</b>")
     else:
-        lines.append(f"\n<b>{get_text('total', lang)}: {cart.total}{currency}</b>")
+        lines.append(f"\n<b>{get_text('total', lang)}: {format_money(cart.total)}{currency}</b>")
 
     return "\n".join(lines)
 
 
 @router.callback_query(F.data == "checkout")
-async def start_checkout(callback: CallbackQuery, state: FSMContext):
+async def start_checkout(
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Start checkout process"""
-    lang = await get_user_lang(state)
-    cart = await CartService.get_cart(state, callback.from_user.id)
+    cart = await CartService.get_cart(
+        state, callback.from_user.id, menu_service.get_snapshot(), lang
+    )
 
     if cart.is_empty:
         await callback.answer(get_text("cart_is_empty", lang), show_alert=True)
@@ -107,7 +119,7 @@ async def start_checkout(callback: CallbackQuery, state: FSMContext):
 
     if cart.total < settings.min_order_amount:
         await callback.answer(
-            get_text("min_order_alert", lang, amount=settings.min_order_amount, currency="€"),
+            get_text("min_order_alert", lang, amount=format_money(settings.min_order_amount), currency="€"),
             show_alert=True,
         )
         return
@@ -119,9 +131,8 @@ async def start_checkout(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(OrderState.waiting_for_name)
-async def process_name(message: Message, state: FSMContext):
+async def process_name(message: Message, state: FSMContext, lang: str):
     """Process customer name"""
-    lang = await get_user_lang(state)
     name = message.text.strip()
 
     if len(name) < 2:
@@ -139,9 +150,8 @@ async def process_name(message: Message, state: FSMContext):
 
 
 @router.message(OrderState.waiting_for_phone)
-async def process_phone(message: Message, state: FSMContext):
+async def process_phone(message: Message, state: FSMContext, lang: str):
     """Process customer phone"""
-    lang = await get_user_lang(state)
     phone = message.text.strip()
 
     if not validate_phone(phone):
@@ -158,9 +168,8 @@ async def process_phone(message: Message, state: FSMContext):
 
 
 @router.callback_query(F.data.startswith("delivery_type:"))
-async def process_delivery_type(callback: CallbackQuery, state: FSMContext):
+async def process_delivery_type(callback: CallbackQuery, state: FSMContext, lang: str):
     """Process delivery type selection"""
-    lang = await get_user_lang(state)
     delivery_type = callback.data.split(":")[1]
 
     if delivery_type == "pickup":
@@ -168,7 +177,6 @@ async def process_delivery_type(callback: CallbackQuery, state: FSMContext):
         await state.update_data(
             delivery_type=DeliveryType.PICKUP,
             delivery_address=None,
-            delivery_fee=0,
         )
         await state.set_state(OrderState.waiting_for_delivery_day)
 
@@ -187,9 +195,8 @@ async def process_delivery_type(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(OrderState.waiting_for_address)
-async def process_address(message: Message, state: FSMContext):
+async def process_address(message: Message, state: FSMContext, lang: str):
     """Process delivery address"""
-    lang = await get_user_lang(state)
     address = message.text.strip()
 
     if len(address) < 5:
@@ -197,14 +204,14 @@ async def process_address(message: Message, state: FSMContext):
         return
 
     # Delivery fee is always charged for delivery orders
-    delivery_fee = settings.delivery_fee
+    delivery_fee = get_delivery_fee(DeliveryType.DELIVERY)
 
-    await state.update_data(delivery_address=address, delivery_fee=delivery_fee)
+    await state.update_data(delivery_address=address)
     await state.set_state(OrderState.waiting_for_delivery_day)
 
     fee_text = ""
     if delivery_fee > 0:
-        fee_text = f"\n\n{get_text('delivery_cost', lang, fee=delivery_fee, threshold=settings.free_delivery_threshold, currency='€')}"
+        fee_text = f"\n\n{get_text('delivery_cost', lang, fee=format_money(delivery_fee), threshold=format_money(settings.free_delivery_threshold), currency='€')}"
 
     await message.answer(
         f"{get_text('select_delivery_day', lang)}{fee_text}",
@@ -213,9 +220,8 @@ async def process_address(message: Message, state: FSMContext):
 
 
 @router.callback_query(DaySelectionCallback.filter(), OrderState.waiting_for_delivery_day)
-async def process_day_selection(callback: CallbackQuery, callback_data: DaySelectionCallback, state: FSMContext):
+async def process_day_selection(callback: CallbackQuery, callback_data: DaySelectionCallback, state: FSMContext, lang: str):
     """Process delivery day selection"""
-    lang = await get_user_lang(state)
 
     # Parse the selected date
     selected_date = date.fromisoformat(callback_data.day)
@@ -236,9 +242,8 @@ async def process_day_selection(callback: CallbackQuery, callback_data: DaySelec
 
 
 @router.callback_query(TimeSlotCallback.filter(), OrderState.waiting_for_time_slot)
-async def process_time_slot_selection(callback: CallbackQuery, callback_data: TimeSlotCallback, state: FSMContext):
+async def process_time_slot_selection(callback: CallbackQuery, callback_data: TimeSlotCallback, state: FSMContext, lang: str):
     """Process time slot selection"""
-    lang = await get_user_lang(state)
     data = await state.get_data()
 
     # Get saved date
@@ -261,16 +266,19 @@ async def process_time_slot_selection(callback: CallbackQuery, callback_data: Ti
 
 
 @router.callback_query(F.data == "skip_comment")
-async def skip_comment(callback: CallbackQuery, state: FSMContext):
+async def skip_comment(
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Skip comment and proceed to confirmation"""
     await state.update_data(comment=None)
-    await show_confirmation(callback, state)
+    await show_confirmation(callback, state, menu_service, lang)
 
 
 @router.message(OrderState.waiting_for_comment)
-async def process_comment(message: Message, state: FSMContext):
+async def process_comment(
+    message: Message, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Process order comment"""
-    lang = await get_user_lang(state)
     comment = message.text.strip()
 
     if len(comment) > 500:
@@ -285,7 +293,9 @@ async def process_comment(message: Message, state: FSMContext):
     # Show confirmation
     await state.set_state(OrderState.confirmation)
 
-    cart = await CartService.get_cart(state, message.from_user.id)
+    cart = await CartService.get_cart(
+        state, message.from_user.id, menu_service.get_snapshot(), lang
+    )
     data = await state.get_data()
 
     summary = format_order_summary(
@@ -296,19 +306,22 @@ async def process_comment(message: Message, state: FSMContext):
         delivery_address=data.get("delivery_address"),
         delivery_time=data["delivery_time"],
         comment=comment,
-        delivery_fee=data.get("delivery_fee", 0),
+        delivery_fee=get_delivery_fee(data["delivery_type"]),
         lang=lang,
     )
 
     await message.answer(summary, reply_markup=get_confirm_order_keyboard(lang))
 
 
-async def show_confirmation(callback: CallbackQuery, state: FSMContext):
+async def show_confirmation(
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Show order confirmation"""
-    lang = await get_user_lang(state)
     await state.set_state(OrderState.confirmation)
 
-    cart = await CartService.get_cart(state, callback.from_user.id)
+    cart = await CartService.get_cart(
+        state, callback.from_user.id, menu_service.get_snapshot(), lang
+    )
     data = await state.get_data()
 
     summary = format_order_summary(
@@ -319,7 +332,7 @@ async def show_confirmation(callback: CallbackQuery, state: FSMContext):
         delivery_address=data.get("delivery_address"),
         delivery_time=data["delivery_time"],
         comment=data.get("comment"),
-        delivery_fee=data.get("delivery_fee", 0),
+        delivery_fee=get_delivery_fee(data["delivery_type"]),
         lang=lang,
     )
 
@@ -330,9 +343,10 @@ async def show_confirmation(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data == "order_back")
-async def order_back(callback: CallbackQuery, state: FSMContext):
+async def order_back(
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Go back in order flow"""
-    lang = await get_user_lang(state)
     current_state = await state.get_state()
     data = await state.get_data()
 
@@ -372,7 +386,9 @@ async def order_back(callback: CallbackQuery, state: FSMContext):
 
     else:
         # Default - back to cart
-        cart = await CartService.get_cart(state, callback.from_user.id)
+        cart = await CartService.get_cart(
+            state, callback.from_user.id, menu_service.get_snapshot(), lang
+        )
         from app.handlers.cart import format_cart_text
 
         # Keep language when clearing state
@@ -386,16 +402,24 @@ async def order_back(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(OrderCallback.filter(F.action == "confirm"))
+# Answers itself with a toast once the order is journaled
+@router.callback_query(
+    OrderCallback.filter(F.action == "confirm"), flags={"early_answer": False}
+)
 async def confirm_order(
     callback: CallbackQuery,
     state: FSMContext,
     sheets_service: GoogleSheetsService,
     notification_service: NotificationService,
+    order_outbox: OrderOutbox,
+    order_ids: OrderIdAllocator,
+    menu_service: MenuService,
+    lang: str,
 ):
     """Confirm and save order"""
-    lang = await get_user_lang(state)
-    cart = await CartService.get_cart(state, callback.from_user.id)
+    cart = await CartService.get_cart(
+        state, callback.from_user.id, menu_service.get_snapshot(), lang
+    )
 
     if cart.is_empty:
         await callback.answer(get_text("cart_is_empty", lang), show_alert=True)
@@ -404,7 +428,7 @@ async def confirm_order(
     data = await state.get_data()
 
     # Generate order ID
-    order_id = await sheets_service.get_next_order_id()
+    order_id = await order_ids.next_id()
 
     # Create order
     order = Order.from_cart(
@@ -417,18 +441,23 @@ async def confirm_order(
         delivery_address=data.get("delivery_address"),
         delivery_time=data["delivery_time"],
         cart_items=cart.items,
-        delivery_fee=data.get("delivery_fee", 0),
+        delivery_fee=get_delivery_fee(data["delivery_type"]),
         comment=data.get("comment"),
     )
 
-    # Save to Google Sheets
-    saved = await sheets_service.save_order(order)
+    # Journal the order; sheets and kitchen channel get it in background
+    saved = notified = await order_outbox.enqueue(order)
+    await callback.answer(get_text("order_placed", lang))
 
-    # Send notification to kitchen channel
-    notified = await notification_service.send_order_notification(order)
+    if not saved:
+        # Local journal unavailable, deliver inline
+        saved = await sheets_service.save_order(order)
+        notified = await notification_service.send_order_notification(order)
 
     # Clear cart and state, but keep language
-    await CartService.clear_cart(state, callback.from_user.id)
+    await CartService.clear_cart(
+        state, callback.from_user.id, menu_service.get_snapshot(), lang
+    )
     await state.clear()
     await state.update_data(lang=lang)
 
@@ -441,7 +470,7 @@ async def confirm_order(
         "order_success",
         lang,
         order_id=order.order_id,
-        total=order.total,
+        total=format_money(order.total),
         phone=order.customer_phone,
         currency="€",
     ) + save_note
@@ -449,14 +478,16 @@ async def confirm_order(
     await callback.message.edit_text(
         success_text, reply_markup=get_order_complete_keyboard(lang)
     )
-    await callback.answer(get_text("order_placed", lang))
 
 
 @router.callback_query(OrderCallback.filter(F.action == "cancel"))
-async def cancel_order(callback: CallbackQuery, state: FSMContext):
+async def cancel_order(
+    callback: CallbackQuery, state: FSMContext, menu_service: MenuService, lang: str
+):
     """Cancel order and return to cart"""
-    lang = await get_user_lang(state)
-    cart = await CartService.get_cart(state, callback.from_user.id)
+    cart = await CartService.get_cart(
+        state, callback.from_user.id, menu_service.get_snapshot(), lang
+    )
 
     # Clear order state but keep cart and language
     cart_data = (await state.get_data()).get("cart")
@@ -467,8 +498,9 @@ async def cancel_order(callback: CallbackQuery, state: FSMContext):
 
     from app.handlers.cart import format_cart_text
 
+    # Toast first, before the edit round trip
+    await callback.answer(get_text("order_cancelled", lang))
     await callback.message.edit_text(
         format_cart_text(cart, lang),
         reply_markup=get_cart_keyboard(cart, lang),
     )
-    await callback.answer(get_text("order_cancelled", lang))
@@ -1,3 +1,10 @@
-from app.i18n.translations import get_text, TEXTS, LANGUAGES, DEFAULT_LANGUAGE
+from app.i18n.translations import (
+    get_text,
+    resolve_language,
+    TEXTS,
+    LANGUAGES,
+    DEFAULT_LANGUAGE,
+    CATALOG,
+)
 
-__all__ = ["get_text", "TEXTS", "LANGUAGES", "DEFAULT_LANGUAGE"]
+__all__ = ["get_text", "resolve_language", "TEXTS", "LANGUAGES", "DEFAULT_LANGUAGE", "CATALOG"]
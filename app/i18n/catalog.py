@@ -0,0 +1,95 @@
+from string import Formatter
+from typing import Optional
+
+
+class Template:
+    """
+    Translation text parsed once into a %-style format string.
+
+    ``{name}`` placeholders become ``%(name)s`` so rendering is a single
+    C-level ``%`` with the keyword arguments as mapping. Texts using
+    format specs, conversions or attribute access keep ``str.format``.
+    """
+
+    __slots__ = ("text", "fields", "_percent")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.fields: frozenset[str] = frozenset()
+        self._percent: Optional[str] = None
+
+        parts = []
+        fields = set()
+        simple = True
+        for literal, field, spec, conversion in Formatter().parse(text):
+            parts.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            fields.add(field)
+            if spec or conversion or not field.isidentifier():
+                simple = False
+            parts.append(f"%({field})s")
+        self.fields = frozenset(fields)
+        if simple:
+            self._percent = "".join(parts)
+
+    def render(self, kwargs: dict) -> str:
+        try:
+            if self._percent is not None:
+                return self._percent % kwargs
+            return self.text.format(**kwargs)
+        except KeyError:
+            # A missing argument leaves the text unformatted
+            return self.text
+
+
+class Catalog:
+    """Translations with language fallbacks resolved ahead of time"""
+
+    def __init__(
+        self,
+        texts: dict[str, dict[str, str]],
+        languages: list[str],
+        default_language: str,
+    ):
+        self.default_language = default_language
+        self._tables: dict[str, dict[str, Template]] = {}
+        for lang in languages:
+            table = {}
+            for key, translations in texts.items():
+                if lang in translations:
+                    text = translations[lang]
+                else:
+                    text = translations.get(default_language, f"[Missing: {key}]")
+                table[key] = Template(text)
+            self._tables[lang] = table
+        self._default = self._tables[default_language]
+        self._texts = texts
+        self._languages = list(languages)
+
+    def get(self, key: str, lang: str, kwargs: dict) -> str:
+        template = self._tables.get(lang, self._default).get(key)
+        if template is None:
+            return f"[Missing: {key}]"
+        if kwargs:
+            return template.render(kwargs)
+        return template.text
+
+    def validate(self) -> list[str]:
+        """Missing translations and placeholders that differ from the default"""
+        problems = []
+        for key, translations in self._texts.items():
+            missing = [lang for lang in self._languages if lang not in translations]
+            if missing:
+                problems.append(f"{key}: no {', '.join(missing)} text")
+            expected = self._default[key].fields
+            for lang in self._languages:
+                if lang not in translations or lang == self.default_language:
+                    continue
+                fields = self._tables[lang][key].fields
+                if fields != expected:
+                    problems.append(
+                        f"{key}[{lang}]: placeholders {sorted(fields)}, "
+                        f"{self.default_language} has {sorted(expected)}"
+                    )
+        return problems
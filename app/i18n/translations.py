@@ -3,6 +3,8 @@ Translations for the Sushi Bot.
 Supported languages: en, fr, uk, ru
 """
 
+from app.i18n.catalog import Catalog
+
 LANGUAGES = {
     "en": {"flag": "🇬🇧", "name": "English"},
     "fr": {"flag": "🇫🇷", "name": "Français"},
@@ -685,6 +687,15 @@ TEXTS = {
 }
 
 
+# Compiled once at import: fallbacks resolved, templates pre-parsed
+CATALOG = Catalog(TEXTS, list(LANGUAGES), DEFAULT_LANGUAGE)
+
+
+def resolve_language(lang: str | None) -> str:
+    """Supported language code for ``lang``, DEFAULT_LANGUAGE otherwise"""
+    return lang if lang in LANGUAGES else DEFAULT_LANGUAGE
+
+
 def get_text(key: str, lang: str = DEFAULT_LANGUAGE, **kwargs) -> str:
     """
     Get translated text by key.
@@ -697,20 +708,4 @@ def get_text(key: str, lang: str = DEFAULT_LANGUAGE, **kwargs) -> str:
     Returns:
         Translated and formatted string
     """
-    if key not in TEXTS:
-        return f"[Missing: {key}]"
-
-    translations = TEXTS[key]
-
-    if lang not in translations:
-        lang = DEFAULT_LANGUAGE
-
-    text = translations.get(lang, translations.get(DEFAULT_LANGUAGE, f"[Missing: {key}]"))
-
-    if kwargs:
-        try:
-            text = text.format(**kwargs)
-        except KeyError:
-            pass
-
-    return text
+    return CATALOG.get(key, lang, kwargs)
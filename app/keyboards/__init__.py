@@ -12,6 +12,7 @@ from app.keyboards.order_kb import (
     get_skip_comment_keyboard,
     get_confirm_order_keyboard,
 )
+from app.keyboards.static_cache import static_keyboards
 
 __all__ = [
     "get_main_menu_keyboard",
@@ -24,4 +25,5 @@ __all__ = [
     "get_time_slot_keyboard",
     "get_skip_comment_keyboard",
     "get_confirm_order_keyboard",
+    "static_keyboards",
 ]
@@ -4,6 +4,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from app.models.cart import Cart
 from app.filters.callback_data import CartItemCallback
 from app.i18n import get_text
+from app.keyboards.static_cache import static_keyboards
 
 
 def get_cart_keyboard(cart: Cart, lang: str = "en") -> InlineKeyboardMarkup:
@@ -60,6 +61,7 @@ def get_cart_keyboard(cart: Cart, lang: str = "en") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboards.register
 def get_empty_cart_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     """Empty cart keyboard"""
     builder = InlineKeyboardBuilder()
@@ -1,8 +1,10 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from app.models.menu import Menu, Category, MenuItem
+from app.models.menu import Category, MenuItem
 from app.models.cart import Cart
+from app.models.money import format_money
+from app.services.menu_service import MenuIndex
 from app.filters.callback_data import (
     CategoryCallback,
     ItemCallback,
@@ -10,6 +12,7 @@ from app.filters.callback_data import (
     QuantityCallback,
 )
 from app.i18n import get_text, LANGUAGES
+from app.keyboards.static_cache import static_keyboards
 
 
 from urllib.parse import quote
@@ -52,6 +55,7 @@ def get_contacts_keyboard(
     return builder.as_markup()
 
 
+@static_keyboards.register
 def get_language_keyboard() -> InlineKeyboardMarkup:
     """Language selection keyboard"""
     builder = InlineKeyboardBuilder()
@@ -80,6 +84,7 @@ def get_language_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboards.register
 def get_main_menu_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     """Main menu with primary actions"""
     builder = InlineKeyboardBuilder()
@@ -114,11 +119,68 @@ def get_main_menu_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-def get_categories_keyboard(menu: Menu, lang: str = "en") -> InlineKeyboardMarkup:
-    """Category selection keyboard"""
+class MenuKeyboardCache:
+    """
+    Cart-independent parts of the category and item list keyboards.
+
+    Entries are keyed by menu revision, language and category, and are
+    dropped as soon as a newer menu revision shows up. Cached buttons
+    are shared between updates, so callers must not modify them.
+    """
+
+    def __init__(self):
+        self._revision = 0
+        self._categories: dict[str, InlineKeyboardMarkup] = {}
+        # (lang, category_id) -> item rows and the back button row
+        self._items: dict[
+            tuple[str, str],
+            tuple[list[tuple[str, list[InlineKeyboardButton]]], list[InlineKeyboardButton]],
+        ] = {}
+
+    def invalidate(self, snapshot: MenuIndex) -> None:
+        """Forget keyboards of menu revisions older than ``snapshot``"""
+        if snapshot.revision > self._revision:
+            self._revision = snapshot.revision
+            self._categories.clear()
+            self._items.clear()
+
+    def _is_current(self, snapshot: MenuIndex) -> bool:
+        self.invalidate(snapshot)
+        # An update still holding an older snapshot gets fresh,
+        # uncached keyboards
+        return snapshot.revision == self._revision
+
+    def categories(self, snapshot: MenuIndex, lang: str) -> InlineKeyboardMarkup:
+        if not self._is_current(snapshot):
+            return _build_categories_keyboard(snapshot, lang)
+        markup = self._categories.get(lang)
+        if markup is None:
+            markup = self._categories[lang] = _build_categories_keyboard(snapshot, lang)
+        return markup
+
+    def item_rows(self, snapshot: MenuIndex, category: Category, lang: str):
+        if not self._is_current(snapshot):
+            return _build_item_rows(category, lang, snapshot.menu.currency)
+        key = (lang, category.id)
+        rows = self._items.get(key)
+        if rows is None:
+            rows = self._items[key] = _build_item_rows(
+                category, lang, snapshot.menu.currency
+            )
+        return rows
+
+    def clear(self) -> None:
+        self._categories.clear()
+        self._items.clear()
+
+
+menu_keyboards = MenuKeyboardCache()
+
+
+def _build_categories_keyboard(snapshot: MenuIndex, lang: str) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
-    for category in menu.get_sorted_categories():
+    for category in snapshot.sorted_categories:
         available_count = len(category.get_available_items())
         if available_count > 0:
             builder.row(
@@ -140,45 +202,68 @@ def get_categories_keyboard(menu: Menu, lang: str = "en") -> InlineKeyboardMarku
     return builder.as_markup()
 
 
+def _build_item_rows(category: Category, lang: str, currency: str):
+    """One button row per available item, plus the back row"""
+    item_rows = [
+        (
+            item.id,
+            [
+                InlineKeyboardButton(
+                    text=f"{item.get_name(lang)} — {format_money(item.price)}{currency}",
+                    callback_data=ItemCallback(item_id=item.id).pack(),
+                )
+            ],
+        )
+        for item in category.get_available_items()
+    ]
+    back_row = [
+        InlineKeyboardButton(
+            text=f"◀️ {get_text('btn_back_categories', lang)}",
+            callback_data="show_menu",
+        )
+    ]
+    return item_rows, back_row
+
+
+def get_categories_keyboard(snapshot: MenuIndex, lang: str = "en") -> InlineKeyboardMarkup:
+    """Category selection keyboard"""
+    return menu_keyboards.categories(snapshot, lang)
+
+
 def get_items_keyboard(
+    snapshot: MenuIndex,
     category: Category,
     cart: Cart | None = None,
     lang: str = "en",
-    currency: str = "€",
 ) -> InlineKeyboardMarkup:
     """Items list in category"""
-    builder = InlineKeyboardBuilder()
-
-    for item in category.get_available_items():
-        # Check if item is in cart
-        cart_qty = ""
-        if cart and item.id in cart.items:
-            cart_qty = f" ✓{cart.items[item.id].quantity}"
-
-        builder.row(
-            InlineKeyboardButton(
-                text=f"{item.get_name(lang)} — {item.price}{currency}{cart_qty}",
-                callback_data=ItemCallback(item_id=item.id).pack(),
+    item_rows, back_row = menu_keyboards.item_rows(snapshot, category, lang)
+    in_cart = cart.items if cart else {}
+
+    rows = []
+    for item_id, row in item_rows:
+        line = in_cart.get(item_id)
+        if line is None:
+            rows.append(row)
+        else:
+            # Cart badge, the only per-user part
+            button = row[0]
+            rows.append(
+                [button.model_copy(update={"text": f"{button.text} ✓{line.quantity}"})]
             )
-        )
-
-    builder.row(
-        InlineKeyboardButton(
-            text=f"◀️ {get_text('btn_back_categories', lang)}",
-            callback_data="show_menu",
-        )
-    )
+    rows.append(back_row)
 
     # Add cart button if cart has items
     if cart and not cart.is_empty:
-        builder.row(
+        rows.append([
             InlineKeyboardButton(
                 text=f"🛒 {get_text('btn_cart', lang)} ({cart.item_count})",
                 callback_data="show_cart",
             )
-        )
+        ])
 
-    return builder.as_markup()
+    # Rows hold already validated buttons; skip validating them again
+    return InlineKeyboardMarkup.model_construct(inline_keyboard=rows)
 
 
 def get_item_detail_keyboard(
@@ -212,7 +297,7 @@ def get_item_detail_keyboard(
     total = item.price * quantity
     builder.row(
         InlineKeyboardButton(
-            text=f"🛒 {get_text('btn_add_to_cart', lang)} — {total}{currency}",
+            text=f"🛒 {get_text('btn_add_to_cart', lang)} — {format_money(total)}{currency}",
             callback_data=AddToCartCallback(
                 item_id=item.id, quantity=quantity
             ).pack(),
@@ -6,6 +6,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.filters.callback_data import OrderCallback, DaySelectionCallback, TimeSlotCallback
 from app.i18n import get_text
+from app.keyboards.static_cache import static_keyboards
 
 # Paris timezone for France
 PARIS_TZ = pytz.timezone("Europe/Paris")
@@ -205,6 +206,7 @@ def get_time_slot_keyboard(selected_date: date, lang: str = "en") -> InlineKeybo
     return builder.as_markup()
 
 
+@static_keyboards.register
 def get_delivery_type_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     """Delivery type selection"""
     builder = InlineKeyboardBuilder()
@@ -229,6 +231,7 @@ def get_delivery_type_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboards.register
 def get_skip_comment_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     """Skip comment keyboard"""
     builder = InlineKeyboardBuilder()
@@ -249,6 +252,7 @@ def get_skip_comment_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboards.register
 def get_confirm_order_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     """Order confirmation keyboard"""
     builder = InlineKeyboardBuilder()
@@ -269,6 +273,7 @@ def get_confirm_order_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@static_keyboards.register
 def get_order_complete_keyboard(lang: str = "en") -> InlineKeyboardMarkup:
     """Post-order keyboard"""
     builder = InlineKeyboardBuilder()
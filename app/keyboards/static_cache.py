@@ -0,0 +1,58 @@
+from functools import wraps
+from typing import Callable, Iterable
+
+from aiogram.types import InlineKeyboardMarkup
+from loguru import logger
+
+KeyboardBuilder = Callable[..., InlineKeyboardMarkup]
+
+
+class StaticKeyboardCache:
+    """
+    Keyboards whose markup depends only on their arguments (the language).
+
+    Each one is built on first use, or for every language by ``warm_up``,
+    and the same markup object is returned afterwards. Markups are
+    shared between updates, so callers must not modify them.
+    """
+
+    def __init__(self):
+        self._builders: list[KeyboardBuilder] = []
+        self._markups: dict[tuple, InlineKeyboardMarkup] = {}
+
+    def register(self, build: KeyboardBuilder) -> KeyboardBuilder:
+        """Decorator: serve ``build(*args)`` from the cache"""
+        self._builders.append(build)
+
+        @wraps(build)
+        def cached(*args) -> InlineKeyboardMarkup:
+            key = (build, args)
+            markup = self._markups.get(key)
+            if markup is None:
+                markup = self._markups[key] = build(*args)
+            return markup
+
+        cached.build = build
+        return cached
+
+    def warm_up(self, langs: Iterable[str]) -> None:
+        """Build every registered keyboard for every language"""
+        langs = list(langs)
+        for build in self._builders:
+            if build.__code__.co_argcount == 0:
+                self._markups[(build, ())] = build()
+                continue
+            for lang in langs:
+                self._markups[(build, (lang,))] = build(lang)
+        logger.debug(f"Built {len(self._markups)} static keyboards")
+
+    def clear(self) -> None:
+        """Drop all markups, e.g. after texts change"""
+        self._markups.clear()
+
+    def rebuild(self, langs: Iterable[str]) -> None:
+        self.clear()
+        self.warm_up(langs)
+
+
+static_keyboards = StaticKeyboardCache()
@@ -0,0 +1,23 @@
+from app.middlewares.callback_answer import (
+    CallbackAckRequestMiddleware,
+    CallbackAcks,
+    EarlyCallbackAnswerMiddleware,
+)
+from app.middlewares.state_buffer import (
+    BufferedFSMContext,
+    PrefetchFSMContextMiddleware,
+    StateBufferMiddleware,
+)
+from app.middlewares.superseded_edits import SupersededEditsMiddleware
+from app.middlewares.unchanged_edits import SkipUnchangedEditsMiddleware
+
+__all__ = [
+    "BufferedFSMContext",
+    "CallbackAckRequestMiddleware",
+    "CallbackAcks",
+    "EarlyCallbackAnswerMiddleware",
+    "PrefetchFSMContextMiddleware",
+    "SkipUnchangedEditsMiddleware",
+    "StateBufferMiddleware",
+    "SupersededEditsMiddleware",
+]
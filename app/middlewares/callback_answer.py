@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.flags import get_flag
+from aiogram.methods import AnswerCallbackQuery, TelegramMethod
+from aiogram.types import CallbackQuery
+from loguru import logger
+
+from app.services.metrics_service import metrics
+
+
+class _Ack:
+    __slots__ = ("handler", "started", "answered")
+
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.started = time.monotonic()
+        self.answered = False
+
+
+class CallbackAcks:
+    """Callback queries being handled, and whether they are answered yet"""
+
+    def __init__(self):
+        self._acks: dict[str, _Ack] = {}
+
+    def begin(self, query_id: str, handler: str) -> _Ack:
+        ack = self._acks[query_id] = _Ack(handler)
+        return ack
+
+    def get(self, query_id: str):
+        return self._acks.get(query_id)
+
+    def end(self, query_id: str) -> None:
+        self._acks.pop(query_id, None)
+
+
+class EarlyCallbackAnswerMiddleware(BaseMiddleware):
+    """
+    Answers callback queries while their handler is still running.
+
+    Once the handler first waits on I/O (or after ``delay`` seconds),
+    an empty answer is sent so the client stops its spinner. An answer
+    the handler sends before that, such as an alert, goes out as usual,
+    and a later plain ``callback.answer()`` is dropped by
+    CallbackAckRequestMiddleware.
+
+    Handlers that need to answer with text after slow I/O opt out with
+    ``flags={"early_answer": False}``. Queries a handler never answers
+    are answered when it returns.
+    """
+
+    def __init__(self, acks: CallbackAcks, delay: float = 0.0):
+        self.acks = acks
+        self.delay = delay
+
+    async def _answer_early(self, event: CallbackQuery, ack: _Ack) -> None:
+        await asyncio.sleep(self.delay)
+        if ack.answered:
+            return
+        try:
+            await event.answer()
+        except Exception as e:
+            logger.debug(f"Early callback answer failed: {e}")
+
+    async def __call__(
+        self,
+        handler: Callable[[CallbackQuery, dict[str, Any]], Awaitable[Any]],
+        event: CallbackQuery,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        name = handler_object.callback.__name__ if handler_object else "unknown"
+        ack = self.acks.begin(event.id, name)
+
+        early = None
+        if get_flag(data, "early_answer", default=True):
+            early = asyncio.create_task(self._answer_early(event, ack))
+        try:
+            return await handler(event, data)
+        finally:
+            if not ack.answered:
+                if early is not None:
+                    early.cancel()
+                try:
+                    await event.answer()
+                except Exception as e:
+                    logger.debug(f"Callback answer failed: {e}")
+            self.acks.end(event.id)
+
+
+class CallbackAckRequestMiddleware(BaseRequestMiddleware):
+    """
+    Bot session side of early answers.
+
+    Lets only the first answer of a callback query through, and records
+    the time from the start of its handler to that answer, overall and
+    per handler.
+    """
+
+    def __init__(self, acks: CallbackAcks):
+        self.acks = acks
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ):
+        if not isinstance(method, AnswerCallbackQuery):
+            return await make_request(bot, method)
+        ack = self.acks.get(method.callback_query_id)
+        if ack is None:
+            return await make_request(bot, method)
+
+        if ack.answered:
+            # Telegram accepts one answer per query
+            metrics.increment("callbacks.duplicate_answers")
+            if method.text:
+                metrics.increment("callbacks.late_text_dropped")
+                logger.debug(f"{ack.handler}: answer text after early answer dropped")
+            return True
+
+        ack.answered = True
+        result = await make_request(bot, method)
+        elapsed = time.monotonic() - ack.started
+        metrics.observe("callbacks.ack_seconds", elapsed)
+        metrics.observe(f"callbacks.ack_seconds.{ack.handler}", elapsed)
+        return result
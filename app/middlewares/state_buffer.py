@@ -0,0 +1,157 @@
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.middleware import FSMContextMiddleware
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StateType
+from aiogram.types import TelegramObject
+
+from app.i18n import resolve_language
+from app.services.metrics_service import metrics
+
+
+class BufferedFSMContext(FSMContext):
+    """
+    FSM context that reads the storage once and writes it back once.
+
+    State and data are loaded when the update starts; every later read
+    is served from memory and every change is kept until ``flush``.
+    Handlers use it like a normal FSMContext.
+    """
+
+    def __init__(
+        self,
+        context: FSMContext,
+        raw_state: Optional[str],
+        raw_data: Optional[dict[str, Any]] = None,
+    ):
+        super().__init__(storage=context.storage, key=context.key)
+        self._state = raw_state
+        self._data: dict[str, Any] = raw_data if raw_data is not None else {}
+        self._loaded = raw_data is not None
+        self._state_changed = False
+        self._data_changed = False
+
+    async def load(self) -> None:
+        """Read data, unless it came together with the state"""
+        if not self._loaded:
+            self._data = await self.storage.get_data(key=self.key)
+            self._loaded = True
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Current data; do not modify in place"""
+        return self._data
+
+    async def get_state(self) -> Optional[str]:
+        return self._state
+
+    async def set_state(self, state: StateType = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        if state != self._state:
+            self._state = state
+            self._state_changed = True
+
+    async def get_data(self) -> dict[str, Any]:
+        return self._data.copy()
+
+    async def get_value(self, key: str, default: Optional[Any] = None) -> Optional[Any]:
+        return self._data.get(key, default)
+
+    async def set_data(self, data: dict[str, Any]) -> None:
+        self._data = data.copy()
+        self._data_changed = True
+
+    async def update_data(
+        self, data: Optional[dict[str, Any]] = None, **kwargs: Any
+    ) -> dict[str, Any]:
+        if data:
+            kwargs.update(data)
+        self._data = {**self._data, **kwargs}
+        self._data_changed = True
+        return self._data.copy()
+
+    async def clear(self) -> None:
+        await self.set_state(None)
+        await self.set_data({})
+
+    async def flush(self) -> None:
+        """Write changed state and data to the storage"""
+        if self._data_changed:
+            await self.storage.set_data(key=self.key, data=self._data)
+            self._data_changed = False
+            metrics.increment("fsm.writes")
+        if self._state_changed:
+            await self.storage.set_state(key=self.key, state=self._state)
+            self._state_changed = False
+            metrics.increment("fsm.writes")
+
+
+class PrefetchFSMContextMiddleware(FSMContextMiddleware):
+    """
+    aiogram's FSM middleware, reading state and data together.
+
+    With a storage that has ``get_state_and_data`` (SharedRedisStorage)
+    both are read in one round trip, under the events isolation lock,
+    and passed on as ``raw_state`` and ``raw_data``. Other storages are
+    read as aiogram does. Register it in place of the dispatcher's own
+    FSM middleware (``Dispatcher(disable_fsm=True)``).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        get_state_and_data = getattr(self.storage, "get_state_and_data", None)
+        if get_state_and_data is None:
+            return await super().__call__(handler, event, data)
+
+        bot: Bot = data["bot"]
+        context = self.resolve_event_context(bot, data)
+        data["fsm_storage"] = self.storage
+        if context is None:
+            return await handler(event, data)
+        async with self.events_isolation.lock(key=context.key):
+            raw_state, raw_data = await get_state_and_data(context.key)
+            data.update({"state": context, "raw_state": raw_state, "raw_data": raw_data})
+            return await handler(event, data)
+
+
+class StateBufferMiddleware(BaseMiddleware):
+    """
+    Loads the user's FSM data once per update and saves it once.
+
+    Replaces ``state`` with a BufferedFSMContext and injects ``lang``, so
+    handlers, CartService and filters share one in-memory copy instead
+    of each reading the storage. Must run after the FSM middleware, i.e.
+    be registered as an update outer middleware on the dispatcher; data
+    prefetched by PrefetchFSMContextMiddleware is used as is.
+
+    Writes are deferred to the end of the update, so updates of one user
+    must not run concurrently (use an events isolation).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        context: Optional[FSMContext] = data.get("state")
+        if context is None:
+            return await handler(event, data)
+
+        state = BufferedFSMContext(context, data.get("raw_state"), data.get("raw_data"))
+        await state.load()
+        metrics.increment("fsm.reads")
+        data["state"] = state
+        # Stored values predate validation in set_language; caches key on lang
+        data["lang"] = resolve_language(state.data.get("lang"))
+
+        try:
+            return await handler(event, data)
+        finally:
+            await state.flush()
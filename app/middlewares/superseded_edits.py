@@ -0,0 +1,51 @@
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import (
+    DeleteMessage,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    TelegramMethod,
+)
+
+from app.middlewares.unchanged_edits import _message_key
+from app.services.edit_coalescer import EditCoalescer
+
+
+class SupersededEditsMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware that keeps coalesced edits from going stale.
+
+    When a handler edits or deletes a message directly, for example
+    going back to the item list after quantity taps, any edit the
+    coalescer still holds for that message is dropped, so it cannot
+    overwrite the newer content or hit a deleted message.
+    """
+
+    def __init__(self, coalescer: EditCoalescer):
+        self.coalescer = coalescer
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ):
+        if isinstance(
+            method,
+            (
+                EditMessageText,
+                EditMessageCaption,
+                EditMessageReplyMarkup,
+                EditMessageMedia,
+                DeleteMessage,
+            ),
+        ):
+            key = _message_key(method)
+            if key is not None and not self.coalescer.is_own(*key, method):
+                self.coalescer.discard(*key)
+        return await make_request(bot, method)
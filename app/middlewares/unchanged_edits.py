@@ -0,0 +1,87 @@
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import (
+    DeleteMessage,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.types import Message
+
+from app.services.metrics_service import metrics
+from app.services.render_fingerprint import RenderFingerprints, render_fingerprint
+
+
+def _message_key(method: TelegramMethod) -> Optional[tuple[int, int]]:
+    """(chat_id, message_id) of an edit, if it targets a chat message by numeric id"""
+    chat_id = getattr(method, "chat_id", None)
+    message_id = getattr(method, "message_id", None)
+    if isinstance(chat_id, int) and message_id is not None:
+        return chat_id, message_id
+    return None
+
+
+class SkipUnchangedEditsMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware that drops edits which would change nothing.
+
+    Remembers the fingerprint of every text or caption the bot sends or
+    edits. An edit of the same message with the same text and keyboard
+    is answered locally with ``True`` instead of a round trip that
+    Telegram would reject with "message is not modified".
+    """
+
+    def __init__(self, fingerprints: RenderFingerprints):
+        self.fingerprints = fingerprints
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ):
+        if isinstance(method, (EditMessageText, EditMessageCaption)):
+            key = _message_key(method)
+            if key is None:
+                return await make_request(bot, method)
+            text = method.text if isinstance(method, EditMessageText) else method.caption
+            fingerprint = render_fingerprint(text or "", method.reply_markup)
+            if self.fingerprints.get(*key) == fingerprint:
+                metrics.increment("edits.unchanged_skipped")
+                return True
+            try:
+                result = await make_request(bot, method)
+            except TelegramBadRequest as e:
+                if "message is not modified" in str(e):
+                    metrics.increment("edits.not_modified")
+                    self.fingerprints.remember(*key, fingerprint)
+                raise
+            self.fingerprints.remember(*key, fingerprint)
+            return result
+
+        if isinstance(method, (EditMessageReplyMarkup, EditMessageMedia, DeleteMessage)):
+            # Content changed in a way not tracked here
+            key = _message_key(method)
+            if key is not None:
+                self.fingerprints.forget(*key)
+            return await make_request(bot, method)
+
+        result = await make_request(bot, method)
+        if isinstance(method, (SendMessage, SendPhoto)) and isinstance(result, Message):
+            text = method.text if isinstance(method, SendMessage) else method.caption
+            self.fingerprints.remember(
+                result.chat.id,
+                result.message_id,
+                render_fingerprint(text or "", method.reply_markup),
+            )
+        return result
@@ -1,5 +1,6 @@
 from app.models.menu import MenuItem, Category, RestaurantInfo, Menu
-from app.models.cart import CartItem, Cart
+from app.models.cart import CartLine, Cart
+from app.models.money import Money, to_cents, format_money
 from app.models.order import Order, OrderItem, OrderStatus, DeliveryType
 
 __all__ = [
@@ -7,8 +8,11 @@ __all__ = [
     "Category",
     "RestaurantInfo",
     "Menu",
-    "CartItem",
+    "CartLine",
     "Cart",
+    "Money",
+    "to_cents",
+    "format_money",
     "Order",
     "OrderItem",
     "OrderStatus",
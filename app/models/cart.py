@@ -1,94 +1,113 @@
-from pydantic import BaseModel
-from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
+if TYPE_CHECKING:
+    from app.services.menu_service import MenuIndex
 
-class CartItem(BaseModel):
-    """Single item in the cart"""
 
-    item_id: str
-    name: str
-    price: float
-    quantity: int
-
-    @property
-    def subtotal(self) -> float:
-        """Calculate item subtotal"""
-        return self.price * self.quantity
+class CartLine:
+    """Single item in the cart, priced from the menu"""
 
+    __slots__ = ("item_id", "name", "price", "quantity")
 
-class Cart(BaseModel):
-    """Shopping cart for a user"""
-
-    user_id: int
-    items: dict[str, CartItem] = {}
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    def __init__(self, item_id: str, name: str, price: int, quantity: int):
+        self.item_id = item_id
+        self.name = name
+        self.price = price
+        self.quantity = quantity
 
     @property
-    def total(self) -> float:
-        """Calculate cart total"""
-        return sum(item.subtotal for item in self.items.values())
+    def subtotal(self) -> int:
+        """Calculate item subtotal in cents"""
+        return self.price * self.quantity
 
-    @property
-    def item_count(self) -> int:
-        """Total number of items in cart"""
-        return sum(item.quantity for item in self.items.values())
+
+class Cart:
+    """Shopping cart for a user.
+
+    Stored as ``{item_id: quantity}`` only; names and prices come from
+    the menu snapshot the cart is opened with, so a cart always shows
+    current prices. Items that are no longer on the menu are dropped.
+    Prices and total are integer cents.
+    Total and item count are kept up to date on every change instead
+    of being recomputed on each access.
+    """
+
+    __slots__ = ("user_id", "items", "total", "item_count", "_menu", "_lang")
+
+    def __init__(
+        self,
+        user_id: int,
+        menu: "MenuIndex",
+        lang: str,
+        quantities: Optional[dict[str, int]] = None,
+    ):
+        self.user_id = user_id
+        self.items: dict[str, CartLine] = {}
+        self.total = 0
+        self.item_count = 0
+        self._menu = menu
+        self._lang = lang
+        for item_id, quantity in (quantities or {}).items():
+            self.add_item(item_id, quantity)
 
     @property
     def is_empty(self) -> bool:
         """Check if cart is empty"""
-        return len(self.items) == 0
+        return not self.items
+
+    def to_quantities(self) -> dict[str, int]:
+        """Compact form for FSM storage"""
+        return {item_id: line.quantity for item_id, line in self.items.items()}
+
+    def _change(self, line: CartLine, delta: int) -> None:
+        line.quantity += delta
+        self.total += line.price * delta
+        self.item_count += delta
+        if line.quantity <= 0:
+            del self.items[line.item_id]
 
-    def add_item(
-        self, item_id: str, name: str, price: float, quantity: int = 1
-    ) -> None:
+    def add_item(self, item_id: str, quantity: int = 1) -> None:
         """Add item to cart or increase quantity"""
-        if item_id in self.items:
-            self.items[item_id].quantity += quantity
-        else:
-            self.items[item_id] = CartItem(
-                item_id=item_id,
-                name=name,
-                price=price,
-                quantity=quantity,
+        line = self.items.get(item_id)
+        if line is None:
+            item = self._menu.get_item(item_id)
+            if item is None or quantity <= 0:
+                return
+            line = self.items[item_id] = CartLine(
+                item_id, item.get_name(self._lang), item.price, 0
             )
-        self.updated_at = datetime.now()
+        self._change(line, quantity)
 
     def remove_item(self, item_id: str) -> None:
         """Remove item from cart"""
-        if item_id in self.items:
-            del self.items[item_id]
-            self.updated_at = datetime.now()
+        line = self.items.get(item_id)
+        if line is not None:
+            self._change(line, -line.quantity)
 
     def update_quantity(self, item_id: str, quantity: int) -> None:
         """Update item quantity"""
-        if item_id in self.items:
-            if quantity <= 0:
-                self.remove_item(item_id)
-            else:
-                self.items[item_id].quantity = quantity
-                self.updated_at = datetime.now()
+        line = self.items.get(item_id)
+        if line is not None:
+            self._change(line, max(quantity, 0) - line.quantity)
 
     def increment_item(self, item_id: str) -> None:
         """Increase item quantity by 1"""
-        if item_id in self.items:
-            self.items[item_id].quantity += 1
-            self.updated_at = datetime.now()
+        line = self.items.get(item_id)
+        if line is not None:
+            self._change(line, 1)
 
     def decrement_item(self, item_id: str) -> None:
         """Decrease item quantity by 1, remove if 0"""
-        if item_id in self.items:
-            self.items[item_id].quantity -= 1
-            if self.items[item_id].quantity <= 0:
-                self.remove_item(item_id)
-            else:
-                self.updated_at = datetime.now()
+        line = self.items.get(item_id)
+        if line is not None:
+            self._change(line, -1)
 
     def clear(self) -> None:
         """Clear all items from cart"""
         self.items = {}
-        self.updated_at = datetime.now()
+        self.total = 0
+        self.item_count = 0
 
-    def get_item(self, item_id: str) -> CartItem | None:
+    def get_item(self, item_id: str) -> CartLine | None:
         """Get cart item by ID"""
         return self.items.get(item_id)
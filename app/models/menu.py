@@ -1,6 +1,8 @@
 from typing import Optional
 from pydantic import BaseModel
 
+from app.models.money import Money
+
 DEFAULT_LANG = "en"
 
 
@@ -26,7 +28,7 @@ class MenuItem(BaseModel):
     id: str
     name: LocalizedString
     description: LocalizedString
-    price: float
+    price: Money
     weight: str
     pieces: Optional[int] = None
     available: bool = True
@@ -68,7 +70,7 @@ class RestaurantInfo(BaseModel):
     address: str = ""
     instagram: str = ""
     working_hours: LocalizedString
-    min_order_amount: int
+    min_order_amount: Money
 
     def get_name(self, lang: str = DEFAULT_LANG) -> str:
         """Get restaurant name in specified language"""
@@ -0,0 +1,29 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Annotated, Union
+
+from pydantic import BeforeValidator
+
+
+def to_cents(value: Union[int, float, str, Decimal]) -> int:
+    """Amount in euros (as written in menu.json or .env) to integer cents"""
+    # Through str, so 18.1 becomes exactly 1810 and not 1809
+    try:
+        euros = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"not an amount: {value!r}") from None
+    return int((euros * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def format_money(cents: int) -> str:
+    """Cents for display: 1500 -> "15", 1850 -> "18.50" """
+    sign = "-" if cents < 0 else ""
+    euros, rest = divmod(abs(cents), 100)
+    if rest:
+        return f"{sign}{euros}.{rest:02d}"
+    return f"{sign}{euros}"
+
+
+# Field given in euros on input and held as integer cents afterwards.
+# Only for input models (menu, settings): validating a dumped value
+# again would convert it twice.
+Money = Annotated[int, BeforeValidator(to_cents)]
@@ -1,8 +1,11 @@
+import json
 from enum import Enum
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
+from app.models.money import to_cents
+
 
 class OrderStatus(str, Enum):
     """Order status enum"""
@@ -24,7 +27,7 @@ class DeliveryType(str, Enum):
 
 
 class OrderItem(BaseModel):
-    """Single item in order"""
+    """Single item in order, amounts in cents"""
 
     item_id: str
     name: str
@@ -34,7 +37,7 @@ class OrderItem(BaseModel):
 
 
 class Order(BaseModel):
-    """Complete order model"""
+    """Complete order model, amounts in cents"""
 
     order_id: str
     user_id: int
@@ -63,6 +66,22 @@ class Order(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    # Orders journaled before amounts moved to cents lack this flag
+    amounts_in_cents: bool = True
+
+    @classmethod
+    def from_journal(cls, payload: str) -> "Order":
+        """Load an order stored as JSON, upgrading whole-euro amounts"""
+        data = json.loads(payload)
+        if "amounts_in_cents" not in data:
+            for key in ("subtotal", "delivery_fee", "total"):
+                if key in data:
+                    data[key] = to_cents(data[key])
+            for item in data.get("items", []):
+                item["price"] = to_cents(item["price"])
+                item["subtotal"] = to_cents(item["subtotal"])
+        return cls.model_validate(data)
+
     @classmethod
     def from_cart(
         cls,
@@ -1,8 +1,8 @@
-from typing import Optional
 from aiogram.fsm.context import FSMContext
 
-from app.models.cart import Cart, CartItem
+from app.models.cart import Cart
 from app.models.menu import MenuItem
+from app.services.menu_service import MenuIndex
 
 
 class CartService:
@@ -11,91 +11,89 @@ class CartService:
     CART_KEY = "cart"
 
     @staticmethod
-    async def get_cart(state: FSMContext, user_id: int) -> Cart:
-        """Get or create cart from state"""
-        data = await state.get_data()
-        cart_data = data.get(CartService.CART_KEY)
-
-        if cart_data:
-            # Reconstruct cart from stored data
-            cart = Cart(
-                user_id=user_id,
-                items={
-                    k: CartItem(**v) for k, v in cart_data.get("items", {}).items()
-                },
-            )
-        else:
-            cart = Cart(user_id=user_id)
+    def _decode(cart_data) -> dict[str, int]:
+        """Stored cart as {item_id: quantity}"""
+        if not cart_data:
+            return {}
+        if "items" in cart_data and isinstance(cart_data["items"], dict):
+            # Format used before carts were stored compactly
+            return {
+                item_id: item["quantity"]
+                for item_id, item in cart_data["items"].items()
+            }
+        return cart_data
 
-        return cart
+    @staticmethod
+    async def get_cart(
+        state: FSMContext, user_id: int, menu: MenuIndex, lang: str
+    ) -> Cart:
+        """Get or create cart from state"""
+        cart_data = await state.get_value(CartService.CART_KEY)
+        return Cart(user_id, menu, lang, CartService._decode(cart_data))
 
     @staticmethod
     async def save_cart(state: FSMContext, cart: Cart) -> None:
         """Save cart to state"""
-        cart_data = {
-            "user_id": cart.user_id,
-            "items": {k: v.model_dump() for k, v in cart.items.items()},
-        }
-        await state.update_data(**{CartService.CART_KEY: cart_data})
+        await state.update_data(**{CartService.CART_KEY: cart.to_quantities()})
 
     @staticmethod
     async def add_item(
         state: FSMContext,
         user_id: int,
+        menu: MenuIndex,
         item: MenuItem,
         quantity: int = 1,
         lang: str = "en",
     ) -> Cart:
         """Add item to cart"""
-        cart = await CartService.get_cart(state, user_id)
-        cart.add_item(
-            item_id=item.id,
-            name=item.get_name(lang),
-            price=item.price,
-            quantity=quantity,
-        )
+        cart = await CartService.get_cart(state, user_id, menu, lang)
+        cart.add_item(item.id, quantity)
         await CartService.save_cart(state, cart)
         return cart
 
     @staticmethod
     async def remove_item(
-        state: FSMContext, user_id: int, item_id: str
+        state: FSMContext, user_id: int, menu: MenuIndex, lang: str, item_id: str
     ) -> Cart:
         """Remove item from cart"""
-        cart = await CartService.get_cart(state, user_id)
+        cart = await CartService.get_cart(state, user_id, menu, lang)
         cart.remove_item(item_id)
         await CartService.save_cart(state, cart)
         return cart
 
     @staticmethod
     async def increment_item(
-        state: FSMContext, user_id: int, item_id: str
+        state: FSMContext, user_id: int, menu: MenuIndex, lang: str, item_id: str
     ) -> Cart:
         """Increment item quantity"""
-        cart = await CartService.get_cart(state, user_id)
+        cart = await CartService.get_cart(state, user_id, menu, lang)
         cart.increment_item(item_id)
         await CartService.save_cart(state, cart)
         return cart
 
     @staticmethod
     async def decrement_item(
-        state: FSMContext, user_id: int, item_id: str
+        state: FSMContext, user_id: int, menu: MenuIndex, lang: str, item_id: str
     ) -> Cart:
         """Decrement item quantity"""
-        cart = await CartService.get_cart(state, user_id)
+        cart = await CartService.get_cart(state, user_id, menu, lang)
         cart.decrement_item(item_id)
         await CartService.save_cart(state, cart)
         return cart
 
     @staticmethod
-    async def clear_cart(state: FSMContext, user_id: int) -> Cart:
+    async def clear_cart(
+        state: FSMContext, user_id: int, menu: MenuIndex, lang: str
+    ) -> Cart:
         """Clear all items from cart"""
-        cart = Cart(user_id=user_id)
+        cart = Cart(user_id, menu, lang)
         await CartService.save_cart(state, cart)
         return cart
 
     @staticmethod
-    async def get_cart_total(state: FSMContext, user_id: int) -> float:
-        """Get cart total"""
-        cart = await CartService.get_cart(state, user_id)
+    async def get_cart_total(
+        state: FSMContext, user_id: int, menu: MenuIndex, lang: str
+    ) -> int:
+        """Get cart total in cents"""
+        cart = await CartService.get_cart(state, user_id, menu, lang)
         return cart.total
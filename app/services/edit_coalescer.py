@@ -0,0 +1,138 @@
+import asyncio
+from typing import Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.methods import TelegramMethod
+from aiogram.types import InlineKeyboardMarkup, Message
+from loguru import logger
+
+from app.services.metrics_service import metrics
+from app.services.render_fingerprint import RenderFingerprints, render_fingerprint
+
+
+class _PendingEdit:
+    __slots__ = ("message", "text", "reply_markup", "fingerprint")
+
+    def __init__(self, message: Message, text: str, reply_markup, fingerprint: bytes):
+        self.message = message
+        self.text = text
+        self.reply_markup = reply_markup
+        self.fingerprint = fingerprint
+
+
+class EditCoalescer:
+    """
+    Collapses bursts of edits of one message into a single API call.
+
+    The first ``submit`` is sent right away; after each edit, one
+    background task per message waits ``window`` seconds and then sends
+    whatever was submitted meanwhile, so ten quick taps cost two edits.
+    With ``fingerprints``, content equal to what the message already
+    shows is not sent at all.
+
+    Any other edit or deletion of the message supersedes what is still
+    waiting: ``discard`` drops it, and SupersededEditsMiddleware calls
+    it for every such request the bot makes.
+    """
+
+    def __init__(self, fingerprints: Optional[RenderFingerprints] = None, window: float = 0.3):
+        self.fingerprints = fingerprints
+        self.window = window
+        self._pending: dict[tuple[int, int], _PendingEdit] = {}
+        self._tasks: dict[tuple[int, int], asyncio.Task] = {}
+        self._sending: dict[tuple[int, int], TelegramMethod] = {}
+
+    @staticmethod
+    def _key(message: Message) -> tuple[int, int]:
+        return message.chat.id, message.message_id
+
+    def submit(
+        self,
+        message: Message,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+    ) -> None:
+        """Schedule an edit of the message's text, or caption for photos"""
+        key = self._key(message)
+        fingerprint = render_fingerprint(text, reply_markup)
+        if key in self._pending:
+            metrics.increment("edits.coalesced")
+        self._pending[key] = _PendingEdit(message, text, reply_markup, fingerprint)
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._run(key))
+
+    def discard(self, chat_id: int, message_id: int) -> None:
+        """Drop edits of a message that something else redraws or deletes"""
+        key = (chat_id, message_id)
+        if self._pending.pop(key, None) is not None:
+            metrics.increment("edits.superseded")
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def is_own(self, chat_id: int, message_id: int, method: TelegramMethod) -> bool:
+        """Whether ``method`` is the edit this coalescer is sending"""
+        return self._sending.get((chat_id, message_id)) is method
+
+    async def _run(self, key: tuple[int, int]) -> None:
+        try:
+            while True:
+                edit = self._pending.pop(key, None)
+                if edit is None:
+                    break
+                if (
+                    self.fingerprints is not None
+                    and self.fingerprints.get(*key) == edit.fingerprint
+                ):
+                    metrics.increment("edits.unchanged_skipped")
+                    continue
+                await self._send(key, edit)
+                await asyncio.sleep(self.window)
+        finally:
+            # A discarded task may finish after a newer one was started
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
+
+    async def _send(self, key: tuple[int, int], edit: _PendingEdit) -> None:
+        for _ in range(2):
+            if edit.message.photo:
+                method = edit.message.edit_caption(
+                    caption=edit.text, reply_markup=edit.reply_markup
+                )
+            else:
+                method = edit.message.edit_text(edit.text, reply_markup=edit.reply_markup)
+            self._sending[key] = method
+            try:
+                await method
+            except TelegramRetryAfter as e:
+                metrics.increment("edits.retry_after")
+                await asyncio.sleep(e.retry_after)
+                # Newer content arrived meanwhile: the loop sends that instead
+                if key in self._pending:
+                    return
+                continue
+            except TelegramBadRequest as e:
+                if "message is not modified" not in str(e):
+                    logger.warning(f"Message edit failed: {e}")
+                    return
+                # Already showing this content
+                self._remember(key, edit.fingerprint)
+                return
+            except Exception as e:
+                logger.warning(f"Message edit failed: {e}")
+                return
+            finally:
+                self._sending.pop(key, None)
+            metrics.increment("edits.sent")
+            self._remember(key, edit.fingerprint)
+            return
+
+    def _remember(self, key: tuple[int, int], fingerprint: bytes) -> None:
+        if self.fingerprints is not None:
+            self.fingerprints.remember(*key, fingerprint)
+
+    async def close(self) -> None:
+        """Send the edits that are still waiting"""
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, Message
+from loguru import logger
+
+
+class ImageCacheService:
+    """
+    Cache of Telegram file_ids for menu images.
+
+    An image is uploaded once; the file_id from the upload response is
+    stored on disk and reused for every later send. Entries are keyed by
+    bot, file path and SHA-256 of the file content, so replacing an image
+    file invalidates its entry.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        # bot_id -> image path -> {"sha256": ..., "file_id": ...}
+        self._entries: dict[str, dict[str, dict[str, str]]] = {}
+        # image path -> ((mtime_ns, size), sha256), to hash each file version once
+        self._hashes: dict[str, tuple[tuple[int, int], str]] = {}
+        self._save_lock = asyncio.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Read cache file if it exists"""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable image cache {self.cache_path}: {e}")
+
+    def _write(self, payload: str) -> None:
+        path = Path(self.cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, path)
+
+    async def _save(self) -> None:
+        async with self._save_lock:
+            payload = json.dumps(self._entries, ensure_ascii=False, indent=1)
+            try:
+                await asyncio.to_thread(self._write, payload)
+            except Exception as e:
+                logger.error(f"Failed to save image cache: {e}")
+
+    def _hash_file(self, path: str) -> str:
+        """SHA-256 of file content, recomputed only when the file changes"""
+        stat = os.stat(path)
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        cached = self._hashes.get(path)
+        if cached and cached[0] == file_stat:
+            return cached[1]
+
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        self._hashes[path] = (file_stat, digest)
+        return digest
+
+    async def get_file_id(self, bot_id: int, path: str) -> Optional[str]:
+        """Cached file_id for the current content of an image"""
+        entry = self._entries.get(str(bot_id), {}).get(path)
+        if entry is None:
+            return None
+        digest = await asyncio.to_thread(self._hash_file, path)
+        if entry["sha256"] != digest:
+            return None
+        return entry["file_id"]
+
+    async def remember(self, bot_id: int, path: str, message: Message) -> None:
+        """Store the file_id Telegram assigned to an uploaded image"""
+        if not message.photo:
+            return
+        digest = await asyncio.to_thread(self._hash_file, path)
+        self._entries.setdefault(str(bot_id), {})[path] = {
+            "sha256": digest,
+            "file_id": message.photo[-1].file_id,
+        }
+        await self._save()
+
+    async def forget(self, bot_id: int, path: str) -> None:
+        """Drop a cached file_id that Telegram no longer accepts"""
+        if self._entries.get(str(bot_id), {}).pop(path, None) is not None:
+            await self._save()
+
+    async def answer_photo(self, message: Message, path: str, **kwargs) -> Message:
+        """Send image as a reply, uploading it only if not cached"""
+        bot_id = message.bot.id
+        file_id = await self.get_file_id(bot_id, path)
+
+        if file_id:
+            try:
+                return await message.answer_photo(photo=file_id, **kwargs)
+            except TelegramBadRequest as e:
+                logger.warning(f"Cached file_id for {path} rejected, re-uploading: {e}")
+                await self.forget(bot_id, path)
+
+        sent = await message.answer_photo(photo=FSInputFile(path), **kwargs)
+        await self.remember(bot_id, path, sent)
+        return sent
+
+    async def warm_up(self, bot: Bot, chat_id: str, paths: list[str]) -> None:
+        """Upload images that are not cached yet to a private chat"""
+        uploaded = 0
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            try:
+                if await self.get_file_id(bot.id, path):
+                    continue
+                sent = await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=FSInputFile(path),
+                    disable_notification=True,
+                )
+                await self.remember(bot.id, path, sent)
+                uploaded += 1
+                try:
+                    await sent.delete()
+                except TelegramBadRequest:
+                    pass
+            except Exception as e:
+                logger.warning(f"Image warm-up failed for {path}: {e}")
+
+        logger.info(f"Image cache warm-up done: {uploaded} image(s) uploaded")
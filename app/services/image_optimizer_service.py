@@ -0,0 +1,201 @@
+"""
+Telegram-sized variants of menu photos.
+
+Each source image is resized to fit ``max_side`` and recompressed as a
+progressive JPEG. Variants are stored in a content-addressed directory:
+the file name is a hash of the source bytes and the encoding settings,
+so an unchanged photo is never re-encoded and an edited one gets a new
+variant automatically.
+
+Run as a build step:
+    python -m app.services.image_optimizer_service
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import threading
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+from loguru import logger
+
+# Pillow is optional: without it the original photos are served
+try:
+    from PIL import Image, ImageOps
+
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+
+class ImageReport(NamedTuple):
+    """Result of optimizing one image"""
+
+    source: str
+    variant: str
+    source_bytes: int
+    variant_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.source_bytes - self.variant_bytes
+
+
+class ImageOptimizerService:
+    """Builds and serves optimized variants of menu images"""
+
+    def __init__(self, cache_dir: str, max_side: int = 1024, quality: int = 80):
+        self.cache_dir = cache_dir
+        self.max_side = max_side
+        self.quality = quality
+        # source path -> file to send instead
+        self._variants: dict[str, str] = {}
+        self._build_task: asyncio.Task | None = None
+        # One build at a time; a newer generation makes a running one stop
+        self._build_lock = threading.Lock()
+        self._generation = 0
+
+        if not PILLOW_AVAILABLE:
+            logger.warning("Pillow not installed, menu images are sent as-is")
+
+    def get_variant(self, path: str) -> str:
+        """File to send for an image: optimized variant if built"""
+        return self._variants.get(path, path)
+
+    def _variant_path(self, source_bytes: bytes) -> Path:
+        digest = hashlib.sha256(source_bytes)
+        digest.update(f"|{self.max_side}|{self.quality}".encode())
+        return Path(self.cache_dir) / f"{digest.hexdigest()[:24]}.jpg"
+
+    def _encode(self, source: Path, target: Path) -> None:
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Unique name: other bot processes may encode the same photo
+            tmp = target.with_name(f"{target.stem}.{uuid.uuid4().hex}.tmp")
+            try:
+                image.save(
+                    tmp,
+                    "JPEG",
+                    quality=self.quality,
+                    optimize=True,
+                    progressive=True,
+                )
+                os.replace(tmp, target)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+    def optimize(self, path: str) -> ImageReport:
+        """Build (or reuse) the variant of one image"""
+        source = Path(path)
+        source_bytes = source.read_bytes()
+
+        if not PILLOW_AVAILABLE:
+            return ImageReport(path, path, len(source_bytes), len(source_bytes))
+
+        target = self._variant_path(source_bytes)
+        if not target.exists():
+            self._encode(source, target)
+
+        variant_bytes = target.stat().st_size
+        if variant_bytes >= len(source_bytes):
+            # Source is already smaller, keep it
+            return ImageReport(path, path, len(source_bytes), len(source_bytes))
+        return ImageReport(path, str(target), len(source_bytes), variant_bytes)
+
+    def build(self, paths: list[str], generation: int | None = None) -> list[ImageReport]:
+        """Optimize all images and switch to the new variants.
+
+        Builds run one at a time. A build of an older ``generation``
+        than the latest requested stops and keeps the current variants.
+        """
+        with self._build_lock:
+            reports = []
+            variants = {}
+            for path in paths:
+                if generation is not None and generation != self._generation:
+                    logger.debug("Image build superseded by a newer one")
+                    return reports
+                if not os.path.exists(path):
+                    continue
+                try:
+                    report = self.optimize(path)
+                except Exception as e:
+                    logger.warning(f"Failed to optimize {path}: {e}")
+                    continue
+                reports.append(report)
+                variants[path] = report.variant
+
+            if generation is None or generation == self._generation:
+                self._variants = variants
+            return reports
+
+    async def build_async(self, paths: list[str]) -> list[ImageReport]:
+        """Optimize images in a worker thread"""
+        self._generation += 1
+        generation = self._generation
+        reports = await asyncio.to_thread(self.build, paths, generation)
+        if generation != self._generation:
+            return reports
+        saved = sum(r.saved_bytes for r in reports)
+        total = sum(r.source_bytes for r in reports)
+        logger.info(
+            f"Image variants ready: {len(reports)} image(s), "
+            f"{saved / 1024:.0f} KB of {total / 1024:.0f} KB saved"
+        )
+        return reports
+
+    def schedule_build(self, paths: list[str]) -> None:
+        """Rebuild variants in the background, e.g. after menu reload"""
+        # Cancelling only stops the wait: the worker thread of the old
+        # build sees the newer generation and stops after its current image
+        if self._build_task is not None and not self._build_task.done():
+            self._build_task.cancel()
+        self._build_task = asyncio.create_task(self.build_async(paths))
+
+
+def print_report(reports: list[ImageReport]) -> None:
+    """Per-image byte savings table"""
+    print(f"{'image':<40}{'source':>10}{'variant':>10}{'saved':>8}")
+    for r in reports:
+        percent = 100 * r.saved_bytes / r.source_bytes if r.source_bytes else 0
+        print(
+            f"{r.source:<40}{r.source_bytes / 1024:>8.0f}KB"
+            f"{r.variant_bytes / 1024:>8.0f}KB{percent:>7.0f}%"
+        )
+    source_total = sum(r.source_bytes for r in reports)
+    variant_total = sum(r.variant_bytes for r in reports)
+    print(
+        f"{'total':<40}{source_total / 1024:>8.0f}KB{variant_total / 1024:>8.0f}KB"
+        f"{100 * (source_total - variant_total) / max(source_total, 1):>7.0f}%"
+    )
+
+
+def main() -> None:
+    from app.services.menu_service import MenuService
+
+    parser = argparse.ArgumentParser(description="Build optimized menu images")
+    parser.add_argument("--menu", default="data/menu.json")
+    parser.add_argument("--cache-dir", default="data/cache/images")
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--quality", type=int, default=80)
+    args = parser.parse_args()
+
+    if not PILLOW_AVAILABLE:
+        sys.exit("Pillow is required: pip install Pillow")
+
+    paths = MenuService(args.menu).get_snapshot().get_image_paths()
+    optimizer = ImageOptimizerService(args.cache_dir, args.max_side, args.quality)
+    print_report(optimizer.build(paths))
+
+
+if __name__ == "__main__":
+    main()
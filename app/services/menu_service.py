@@ -1,8 +1,121 @@
+import asyncio
 import json
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+from loguru import logger
 
 from app.models.menu import Menu, Category, MenuItem
+from app.models.money import format_money
+
+
+class MenuIndex:
+    """Loaded menu together with its lookup tables.
+
+    Built once per load and never mutated afterwards, so swapping
+    the service's index reference replaces menu and lookups in one step.
+    Handlers that hold an index keep working on it even if a reload
+    happens in the middle of their update.
+    """
+
+    __slots__ = (
+        "menu",
+        "revision",
+        "source_stat",
+        "items_by_id",
+        "categories_by_id",
+        "category_by_item_id",
+        "sorted_categories",
+    )
+
+    def __init__(
+        self,
+        menu: Menu,
+        revision: int = 0,
+        source_stat: Optional[tuple[int, int]] = None,
+    ):
+        self.menu = menu
+        self.revision = revision
+        self.source_stat = source_stat
+        self.items_by_id: dict[str, MenuItem] = {}
+        self.categories_by_id: dict[str, Category] = {}
+        self.category_by_item_id: dict[str, Category] = {}
+
+        for category in menu.categories:
+            # Keep the first occurrence, like the linear scans did
+            self.categories_by_id.setdefault(category.id, category)
+            for item in category.items:
+                self.items_by_id.setdefault(item.id, item)
+                self.category_by_item_id.setdefault(item.id, category)
+
+        self.sorted_categories: list[Category] = menu.get_sorted_categories()
+
+    def get_category(self, category_id: str) -> Optional[Category]:
+        """Get category by ID"""
+        return self.categories_by_id.get(category_id)
+
+    def get_item(self, item_id: str) -> Optional[MenuItem]:
+        """Get item by ID"""
+        return self.items_by_id.get(item_id)
+
+    def get_category_for_item(self, item_id: str) -> Optional[Category]:
+        """Find which category contains the item"""
+        return self.category_by_item_id.get(item_id)
+
+    def get_image_paths(self) -> list[str]:
+        """Image files referenced by menu items"""
+        return list(
+            dict.fromkeys(
+                item.image for item in self.items_by_id.values() if item.image
+            )
+        )
+
+
+def diff_menus(old: MenuIndex, new: MenuIndex) -> str:
+    """Short human-readable summary of what changed between two menus"""
+    old_ids = old.items_by_id.keys()
+    new_ids = new.items_by_id.keys()
+
+    added = sorted(new_ids - old_ids)
+    removed = sorted(old_ids - new_ids)
+    price_changes = []
+    availability_changes = []
+    other_changes = 0
+
+    for item_id in sorted(old_ids & new_ids):
+        old_item = old.items_by_id[item_id]
+        new_item = new.items_by_id[item_id]
+        if old_item == new_item:
+            continue
+        if old_item.price != new_item.price:
+            price_changes.append(f"{item_id} {format_money(old_item.price)}->{format_money(new_item.price)}")
+        if old_item.available != new_item.available:
+            state = "on" if new_item.available else "off"
+            availability_changes.append(f"{item_id} {state}")
+        if old_item.model_copy(
+            update={"price": new_item.price, "available": new_item.available}
+        ) != new_item:
+            other_changes += 1
+
+    parts = []
+    if added:
+        parts.append(f"added: {', '.join(added)}")
+    if removed:
+        parts.append(f"removed: {', '.join(removed)}")
+    if price_changes:
+        parts.append(f"price: {', '.join(price_changes)}")
+    if availability_changes:
+        parts.append(f"availability: {', '.join(availability_changes)}")
+    if other_changes:
+        parts.append(f"{other_changes} item(s) edited")
+
+    old_categories = [c.id for c in old.sorted_categories]
+    new_categories = [c.id for c in new.sorted_categories]
+    if old_categories != new_categories:
+        parts.append(f"categories: {old_categories} -> {new_categories}")
+
+    return "; ".join(parts) if parts else "no item changes"
 
 
 class MenuService:
@@ -10,16 +123,53 @@ class MenuService:
 
     def __init__(self, menu_file_path: str):
         self.menu_file_path = menu_file_path
-        self._menu: Optional[Menu] = None
+        self._index: Optional[MenuIndex] = None
+        self._revision = 0
+        # Stat of a file version that failed validation, so a broken
+        # file is reported once instead of on every poll
+        self._failed_stat: Optional[tuple[int, int]] = None
+        self._reload_listeners: list[Callable[[MenuIndex], None]] = []
+
+    def add_reload_listener(self, listener: Callable[[MenuIndex], None]) -> None:
+        """Call listener with the new snapshot after every reload"""
+        self._reload_listeners.append(listener)
+
+    def _file_stat(self) -> tuple[int, int]:
+        """Modification time and size of the menu file"""
+        stat = os.stat(self.menu_file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _build_index(self) -> MenuIndex:
+        """Read and validate menu file and build its lookup tables"""
+        # Stat before reading: if the file changes while we read it,
+        # the next poll sees a different stat and loads it again
+        source_stat = self._file_stat()
+        path = Path(self.menu_file_path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return MenuIndex(Menu(**data), source_stat=source_stat)
+
+    def _swap(self, index: MenuIndex) -> MenuIndex:
+        """Make a freshly built index the current one"""
+        self._revision += 1
+        index.revision = self._revision
+        self._failed_stat = None
+        self._index = index
+        return index
 
     def load_menu(self) -> Menu:
         """Load menu from JSON file"""
-        if self._menu is None:
-            path = Path(self.menu_file_path)
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self._menu = Menu(**data)
-        return self._menu
+        return self.get_snapshot().menu
+
+    def get_snapshot(self) -> MenuIndex:
+        """Get the current menu with its lookup tables.
+
+        Take it once per update and use it for every lookup, so the
+        whole update is served from the same menu version.
+        """
+        if self._index is None:
+            self._swap(self._build_index())
+        return self._index
 
     def get_menu(self) -> Menu:
         """Get loaded menu"""
@@ -27,29 +177,74 @@ class MenuService:
 
     def get_categories(self) -> list[Category]:
         """Get all categories sorted"""
-        menu = self.get_menu()
-        return menu.get_sorted_categories()
+        return self.get_snapshot().sorted_categories
 
     def get_category(self, category_id: str) -> Optional[Category]:
         """Get category by ID"""
-        menu = self.get_menu()
-        return menu.get_category_by_id(category_id)
+        return self.get_snapshot().get_category(category_id)
 
     def get_item(self, item_id: str) -> Optional[MenuItem]:
         """Get item by ID"""
-        menu = self.get_menu()
-        return menu.get_item_by_id(item_id)
+        return self.get_snapshot().get_item(item_id)
 
     def get_category_for_item(self, item_id: str) -> Optional[Category]:
         """Find which category contains the item"""
-        menu = self.get_menu()
-        for category in menu.categories:
-            for item in category.items:
-                if item.id == item_id:
-                    return category
-        return None
+        return self.get_snapshot().get_category_for_item(item_id)
 
     def reload_menu(self) -> Menu:
         """Force reload menu from file"""
-        self._menu = None
-        return self.load_menu()
+        # Build the new index fully before replacing the old one, so a
+        # broken file leaves the current menu in place
+        old = self._index
+        new = self._swap(self._build_index())
+        self._on_reloaded(old, new)
+        return new.menu
+
+    async def reload_if_changed(self) -> bool:
+        """Reload menu if the file changed since the last load.
+
+        Reading and validating happen in a worker thread; only the
+        final reference swap runs on the event loop.
+        """
+        current = self.get_snapshot()
+        stat = await asyncio.to_thread(self._file_stat)
+        if stat == current.source_stat or stat == self._failed_stat:
+            return False
+
+        try:
+            index = await asyncio.to_thread(self._build_index)
+        except Exception:
+            self._failed_stat = stat
+            raise
+
+        self._swap(index)
+        self._on_reloaded(current, index)
+        return True
+
+    async def watch(self, interval: float) -> None:
+        """Poll the menu file and hot-reload it when it changes"""
+        logger.info(f"Watching {self.menu_file_path} every {interval}s")
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_if_changed()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                version = self._index.menu.version if self._index else "-"
+                logger.error(
+                    f"Menu reload failed, keeping version {version}: {e}"
+                )
+
+    def _on_reloaded(self, old: Optional[MenuIndex], new: MenuIndex) -> None:
+        """Log a menu reload and notify listeners"""
+        if old is not None:
+            logger.info(
+                f"Menu reloaded: version {old.menu.version} -> {new.menu.version} "
+                f"(revision {new.revision}), {diff_menus(old, new)}"
+            )
+        for listener in self._reload_listeners:
+            try:
+                listener(new)
+            except Exception as e:
+                logger.error(f"Menu reload listener failed: {e}")
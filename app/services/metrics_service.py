@@ -0,0 +1,92 @@
+import random
+from collections import defaultdict
+from typing import Any
+
+
+class Histogram:
+    """
+    Latency/size distribution kept as a bounded random sample.
+
+    Memory stays constant however many values are observed; count,
+    sum and max are exact, percentiles are estimated from the sample.
+    """
+
+    __slots__ = ("count", "total", "max", "_sample", "_size")
+
+    def __init__(self, size: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._sample: list[float] = []
+        self._size = size
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if len(self._sample) < self._size:
+            self._sample.append(value)
+        else:
+            # Reservoir sampling: every value has the same chance to be kept
+            slot = random.randrange(self.count)
+            if slot < self._size:
+                self._sample[slot] = value
+
+    def summary(self) -> dict[str, float]:
+        ordered = sorted(self._sample)
+
+        def percentile(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)]
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """In-process counters, gauges and histograms"""
+
+    def __init__(self):
+        self.counters: dict[str, int] = defaultdict(int)
+        self.gauges: dict[str, float] = {}
+        self.histograms: dict[str, Histogram] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """All metrics as a JSON-serializable dict"""
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": dict(sorted(self.gauges.items())),
+            "histograms": {
+                name: histogram.summary()
+                for name, histogram in sorted(self.histograms.items())
+            },
+        }
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+
+# Process-wide registry
+metrics = Metrics()
@@ -1,15 +1,38 @@
 from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
 from loguru import logger
 
+from app.models.money import format_money
 from app.models.order import Order, DeliveryType
+from app.services.metrics_service import metrics
+from app.services.order_outbox_service import DeliveryDeferred
+from app.services.resilience import TokenBucket
 
 
 class NotificationService:
     """Service for sending order notifications to Telegram channel"""
 
-    def __init__(self, bot: Bot, channel_id: str):
+    def __init__(self, bot: Bot, channel_id: str, messages_per_minute: int = 20):
         self.bot = bot
         self.channel_id = channel_id
+        self.messages_per_minute = messages_per_minute
+        # Telegram limits posts per chat, so each chat gets its own bucket
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _get_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(
+                "notifications",
+                rate=self.messages_per_minute / 60,
+                capacity=3,
+            )
+        return bucket
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether an orders channel is configured"""
+        return bool(self.channel_id)
 
     def _format_order_for_channel(self, order: Order) -> str:
         """Format order message for kitchen channel"""
@@ -30,15 +53,15 @@ class NotificationService:
         lines.append("📋 <b>Заказ:</b>")
 
         for item in order.items:
-            lines.append(f"• {item.name} x{item.quantity} — {item.subtotal}€")
+            lines.append(f"• {item.name} x{item.quantity} — {format_money(item.subtotal)}€")
 
         lines.append("")
 
         if order.delivery_fee > 0:
-            lines.append(f"Подытог: {order.subtotal}€")
-            lines.append(f"Доставка: {order.delivery_fee}€")
+            lines.append(f"Подытог: {format_money(order.subtotal)}€")
+            lines.append(f"Доставка: {format_money(order.delivery_fee)}€")
 
-        lines.append(f"💰 <b>Итого: {order.total}€</b>")
+        lines.append(f"💰 <b>Итого: {format_money(order.total)}€</b>")
 
         if order.comment:
             lines.append("")
@@ -46,12 +69,19 @@ class NotificationService:
 
         return "\n".join(lines)
 
-    async def send_order_notification(self, order: Order) -> bool:
-        """Send order notification to channel"""
+    async def deliver_order_notification(self, order: Order) -> bool:
+        """Send order notification to channel, paced to Telegram limits.
+
+        Raises DeliveryDeferred when Telegram asks to retry later, so the
+        outbox reschedules the message for exactly that moment.
+        """
         if not self.channel_id:
             logger.warning("Orders channel ID not configured, skipping notification")
             return False
 
+        bucket = self._get_bucket(self.channel_id)
+        await bucket.acquire()
+
         try:
             message = self._format_order_for_channel(order)
 
@@ -61,9 +91,28 @@ class NotificationService:
                 parse_mode="HTML",
             )
 
-            logger.info(f"Order {order.order_id} notification sent to channel")
-            return True
+        except TelegramRetryAfter as e:
+            # Hold every message to this chat, not just this one
+            bucket.pause(e.retry_after)
+            metrics.increment("notifications.retry_after")
+            logger.warning(
+                f"Order {order.order_id} notification rate limited, "
+                f"retry in {e.retry_after}s"
+            )
+            raise DeliveryDeferred(e.retry_after, "Telegram flood control") from e
 
         except Exception as e:
+            metrics.increment("notifications.failed")
             logger.error(f"Failed to send order notification: {e}")
             return False
+
+        metrics.increment("notifications.sent")
+        logger.info(f"Order {order.order_id} notification sent to channel")
+        return True
+
+    async def send_order_notification(self, order: Order) -> bool:
+        """Send order notification to channel"""
+        try:
+            return await self.deliver_order_notification(order)
+        except DeliveryDeferred:
+            return False
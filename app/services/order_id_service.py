@@ -0,0 +1,119 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class OrderIdAllocator:
+    """
+    Persistent per-day sequence of order IDs (``ORD-YYYYMMDD-NNN``).
+
+    The last number handed out for each day lives in a SQLite table and
+    is incremented in a single write transaction, so IDs are unique
+    across concurrent checkouts and across processes sharing the file.
+    """
+
+    PREFIX = "ORD"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="order-ids"
+        )
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open database and create schema"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS order_sequence ("
+            "day TEXT PRIMARY KEY, last INTEGER NOT NULL)"
+        )
+        return conn
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking database call in the allocator thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now().strftime("%Y%m%d")
+
+    @classmethod
+    def format_id(cls, day: str, number: int) -> str:
+        return f"{cls.PREFIX}-{day}-{number:03d}"
+
+    # ---------- Database thread ----------
+
+    def _increment(self, day: str) -> int:
+        # The write lock is taken before reading, so no other process
+        # can get the same number in between
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT INTO order_sequence (day, last) VALUES (?, 1) "
+                "ON CONFLICT (day) DO UPDATE SET last = last + 1",
+                (day,),
+            )
+            (number,) = self._conn.execute(
+                "SELECT last FROM order_sequence WHERE day = ?", (day,)
+            ).fetchone()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return number
+
+    def _seed(self, day: str, last: int) -> None:
+        self._conn.execute(
+            "INSERT INTO order_sequence (day, last) VALUES (?, ?) "
+            "ON CONFLICT (day) DO UPDATE SET last = MAX(last, excluded.last)",
+            (day, last),
+        )
+
+    # ---------- Public API ----------
+
+    async def seed(self, day: str, last: int) -> None:
+        """Make sure numbers for a day continue after ``last``"""
+        await self._run(self._seed, day, last)
+        logger.info(f"Order IDs for {day} seeded, last known number {last:03d}")
+
+    async def next_id(self) -> str:
+        """Allocate the next order ID for today"""
+        day = self.today()
+        try:
+            number = await self._run(self._increment, day)
+        except Exception as e:
+            logger.error(f"Error allocating order ID: {e}")
+            # Fallback to timestamp-based ID
+            return f"{self.PREFIX}-{day}-{datetime.now().strftime('%H%M%S')}"
+        return self.format_id(day, number)
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+
+def parse_order_number(order_id: str, day: str) -> Optional[int]:
+    """Sequence number of an order ID issued on ``day``, if it is one"""
+    prefix = f"{OrderIdAllocator.PREFIX}-{day}-"
+    if not order_id.startswith(prefix):
+        return None
+    try:
+        return int(order_id[len(prefix):])
+    except ValueError:
+        return None
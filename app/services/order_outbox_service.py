@@ -0,0 +1,268 @@
+import asyncio
+import random
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from loguru import logger
+
+from app.models.order import Order
+
+T = TypeVar("T")
+
+# Delivery function of a sink: True when the order reached it
+SinkFunc = Callable[[Order], Awaitable[bool]]
+
+
+class DeliveryDeferred(Exception):
+    """Raised by a sink that was told to retry after a given delay"""
+
+    def __init__(self, retry_after: float, reason: str = ""):
+        super().__init__(reason or f"retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class OrderOutbox:
+    """
+    Durable write-behind queue for confirmed orders.
+
+    ``enqueue`` commits the order to a local SQLite journal and returns
+    at once; one background worker per sink (Google Sheets, kitchen
+    channel, ...) then delivers it with retries and exponential backoff.
+    Delivery is tracked per sink and marked done only after the sink
+    reports success, so every order reaches every sink at least once,
+    also across restarts.
+    """
+
+    BATCH_SIZE = 20
+    # A claimed delivery is retried by anyone after this many seconds,
+    # in case the worker that claimed it died
+    CLAIM_TIMEOUT = 120.0
+    BACKOFF_BASE = 2.0
+    BACKOFF_MAX = 300.0
+    IDLE_POLL = 30.0
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._sinks: dict[str, SinkFunc] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._workers: list[asyncio.Task] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="order-outbox"
+        )
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open database and create schema"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS outbox_orders (
+                order_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS outbox_deliveries (
+                order_id TEXT NOT NULL,
+                sink TEXT NOT NULL,
+                delivered_at TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                PRIMARY KEY (order_id, sink)
+            );
+            CREATE INDEX IF NOT EXISTS outbox_pending
+                ON outbox_deliveries (sink, delivered_at, next_attempt_at);
+            """
+        )
+        conn.commit()
+        return conn
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking database call in the outbox thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def register_sink(self, name: str, deliver: SinkFunc) -> None:
+        """Add a destination every new order is delivered to"""
+        self._sinks[name] = deliver
+        self._wakeups[name] = asyncio.Event()
+
+    # ---------- Database thread ----------
+
+    def _insert(self, order_id: str, payload: str, sinks: list[str]) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO outbox_orders (order_id, payload, created_at) "
+                "VALUES (?, ?, ?)",
+                (order_id, payload, datetime.now().isoformat()),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO outbox_deliveries "
+                "(order_id, sink, next_attempt_at) VALUES (?, ?, ?)",
+                [(order_id, sink, now) for sink in sinks],
+            )
+
+    def _claim_due(self, sink: str, limit: int) -> list[tuple[str, str, int]]:
+        """Take due deliveries, pushing them back by the claim timeout"""
+        now = time.time()
+        with self._conn:
+            # Take the write lock first, so two processes sharing the
+            # database can't claim the same rows
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT d.order_id, o.payload, d.attempts "
+                "FROM outbox_deliveries d JOIN outbox_orders o USING (order_id) "
+                "WHERE d.sink = ? AND d.delivered_at IS NULL AND d.next_attempt_at <= ? "
+                "ORDER BY d.next_attempt_at LIMIT ?",
+                (sink, now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbox_deliveries SET next_attempt_at = ? "
+                "WHERE order_id = ? AND sink = ?",
+                [(now + self.CLAIM_TIMEOUT, row[0], sink) for row in rows],
+            )
+        return rows
+
+    def _next_due_in(self, sink: str) -> Optional[float]:
+        row = self._conn.execute(
+            "SELECT MIN(next_attempt_at) FROM outbox_deliveries "
+            "WHERE sink = ? AND delivered_at IS NULL",
+            (sink,),
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0.0)
+
+    def _record_results(
+        self,
+        sink: str,
+        delivered: list[str],
+        failed: list[tuple[float, str, str]],
+    ) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE outbox_deliveries SET delivered_at = ?, "
+                "attempts = attempts + 1, last_error = NULL "
+                "WHERE order_id = ? AND sink = ?",
+                [(datetime.now().isoformat(), order_id, sink) for order_id in delivered],
+            )
+            self._conn.executemany(
+                "UPDATE outbox_deliveries SET next_attempt_at = ?, "
+                "attempts = attempts + 1, last_error = ? "
+                "WHERE order_id = ? AND sink = ?",
+                [(at, error, order_id, sink) for at, error, order_id in failed],
+            )
+
+    # ---------- Public API ----------
+
+    async def enqueue(self, order: Order) -> bool:
+        """Durably record an order for delivery to every sink"""
+        try:
+            await self._run(
+                self._insert,
+                order.order_id,
+                order.model_dump_json(),
+                list(self._sinks),
+            )
+        except Exception as e:
+            logger.error(f"Failed to journal order {order.order_id}: {e}")
+            return False
+
+        for event in self._wakeups.values():
+            event.set()
+        logger.info(f"Order {order.order_id} queued for {', '.join(self._sinks) or 'no sinks'}")
+        return True
+
+    async def start(self) -> None:
+        """Start one delivery worker per sink"""
+        for sink in self._sinks:
+            self._workers.append(asyncio.create_task(self._worker(sink)))
+
+    async def stop(self) -> None:
+        """Stop workers; unfinished deliveries resume on next start"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+    # ---------- Workers ----------
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter"""
+        delay = min(self.BACKOFF_BASE * 2 ** attempts, self.BACKOFF_MAX)
+        return random.uniform(delay / 2, delay)
+
+    async def _deliver(
+        self, sink: str, payload: str
+    ) -> Optional[tuple[str, Optional[float]]]:
+        """Deliver one order, return error text and retry delay on failure"""
+        try:
+            order = Order.from_journal(payload)
+            if await self._sinks[sink](order):
+                return None
+            return "sink reported failure", None
+        except DeliveryDeferred as e:
+            return str(e), e.retry_after
+        except Exception as e:
+            return str(e) or type(e).__name__, None
+
+    async def _worker(self, sink: str) -> None:
+        wakeup = self._wakeups[sink]
+
+        while True:
+            # Clear before reading, so an order queued meanwhile wakes us
+            wakeup.clear()
+            try:
+                rows = await self._run(self._claim_due, sink, self.BATCH_SIZE)
+            except Exception as e:
+                logger.error(f"Outbox {sink}: failed to read journal: {e}")
+                await asyncio.sleep(self.IDLE_POLL)
+                continue
+
+            if not rows:
+                wait = await self._run(self._next_due_in, sink)
+                timeout = self.IDLE_POLL if wait is None else min(wait, self.IDLE_POLL)
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Deliver the batch concurrently, so sinks can coalesce requests
+            results = await asyncio.gather(
+                *(self._deliver(sink, payload) for _, payload, _ in rows)
+            )
+
+            delivered = []
+            failed = []
+            now = time.time()
+            for (order_id, _, attempts), result in zip(rows, results):
+                if result is None:
+                    delivered.append(order_id)
+                    continue
+                error, retry_after = result
+                if retry_after is not None:
+                    # The sink knows when to come back; jitter spreads retries
+                    retry_in = retry_after + random.uniform(0, 1)
+                else:
+                    retry_in = self._backoff(attempts)
+                failed.append((now + retry_in, error, order_id))
+                logger.warning(
+                    f"Outbox {sink}: order {order_id} attempt {attempts + 1} failed "
+                    f"({error}), retrying in {retry_in:.0f}s"
+                )
+
+            try:
+                await self._run(self._record_results, sink, delivered, failed)
+            except Exception as e:
+                # Claims expire, so these deliveries are retried later
+                logger.error(f"Outbox {sink}: failed to record results: {e}")
@@ -0,0 +1,54 @@
+from app.i18n import get_text
+from app.models.menu import MenuItem
+from app.models.money import format_money
+from app.services.menu_service import MenuIndex
+
+
+def render_item_detail(snapshot: MenuIndex, item: MenuItem, lang: str) -> str:
+    """Item description shown with the quantity selector"""
+    return get_text(
+        "item_detail",
+        lang,
+        name=item.get_name(lang),
+        description=item.get_description(lang),
+        weight=item.weight,
+        pieces=f" | {item.pieces} {get_text('pcs', lang)}" if item.pieces else "",
+        price=format_money(item.price),
+        currency=snapshot.menu.currency,
+        popular=f"\n\n⭐ {get_text('popular_item', lang)}" if item.popular else "",
+    )
+
+
+class ItemTextCache:
+    """
+    Rendered item texts of the current menu revision.
+
+    Keyed by item and language, so it holds at most one text per item
+    and supported language (``lang`` reaches handlers already reduced
+    to LANGUAGES by StateBufferMiddleware). Entries are dropped when a
+    newer revision shows up; updates still holding an older snapshot
+    get uncached texts.
+    """
+
+    def __init__(self):
+        self._revision = 0
+        self._texts: dict[tuple[str, str], str] = {}
+
+    def invalidate(self, snapshot: MenuIndex) -> None:
+        """Forget texts of menu revisions older than ``snapshot``"""
+        if snapshot.revision > self._revision:
+            self._revision = snapshot.revision
+            self._texts.clear()
+
+    def item_detail(self, snapshot: MenuIndex, item: MenuItem, lang: str) -> str:
+        self.invalidate(snapshot)
+        if snapshot.revision != self._revision:
+            return render_item_detail(snapshot, item, lang)
+        key = (item.id, lang)
+        text = self._texts.get(key)
+        if text is None:
+            text = self._texts[key] = render_item_detail(snapshot, item, lang)
+        return text
+
+
+item_texts = ItemTextCache()
@@ -0,0 +1,43 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from aiogram.types import InlineKeyboardMarkup
+
+
+def render_fingerprint(text: str, reply_markup: Optional[InlineKeyboardMarkup]) -> bytes:
+    """Digest of a message's text and keyboard, for "did it change" checks"""
+    digest = hashlib.blake2b(text.encode(), digest_size=16)
+    if reply_markup is not None:
+        digest.update(reply_markup.model_dump_json(exclude_none=True).encode())
+    return digest.digest()
+
+
+class RenderFingerprints:
+    """
+    What recent bot messages show, as render fingerprints.
+
+    Keyed by (chat_id, message_id). Only the ``max_messages`` most
+    recently rendered messages are kept; an unknown message simply
+    counts as changed.
+    """
+
+    def __init__(self, max_messages: int = 20000):
+        self.max_messages = max_messages
+        self._shown: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+
+    def get(self, chat_id: int, message_id: int) -> Optional[bytes]:
+        return self._shown.get((chat_id, message_id))
+
+    def remember(self, chat_id: int, message_id: int, fingerprint: bytes) -> None:
+        key = (chat_id, message_id)
+        self._shown[key] = fingerprint
+        self._shown.move_to_end(key)
+        while len(self._shown) > self.max_messages:
+            self._shown.popitem(last=False)
+
+    def forget(self, chat_id: int, message_id: int) -> None:
+        self._shown.pop((chat_id, message_id), None)
+
+    def __len__(self) -> int:
+        return len(self._shown)
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from enum import Enum
+from typing import Optional
+
+from app.services.metrics_service import metrics
+
+
+class CircuitOpenError(Exception):
+    """Call refused because the circuit breaker is open"""
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Gauge values, so the state can be graphed
+_STATE_GAUGE = {
+    BreakerState.CLOSED: 0,
+    BreakerState.HALF_OPEN: 1,
+    BreakerState.OPEN: 2,
+}
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while.
+
+    After ``failure_threshold`` consecutive failures the breaker opens
+    and calls fail fast. Once ``reset_timeout`` seconds have passed, one
+    probe call is let through (half-open): success closes the breaker,
+    failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._set_state(BreakerState.CLOSED)
+
+    def _set_state(self, state: BreakerState) -> None:
+        self.state = state
+        metrics.set_gauge(f"{self.name}.breaker_state", _STATE_GAUGE[state])
+
+    def allow(self) -> bool:
+        """Whether a call may go through now"""
+        if self.state == BreakerState.CLOSED:
+            return True
+        if self.state == BreakerState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                metrics.increment(f"{self.name}.breaker_rejected")
+                return False
+            self._set_state(BreakerState.HALF_OPEN)
+        # Half-open: a single probe at a time
+        if self._probe_in_flight:
+            metrics.increment(f"{self.name}.breaker_rejected")
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probe_in_flight = False
+        if self.state != BreakerState.CLOSED:
+            self._set_state(BreakerState.CLOSED)
+
+    def release(self) -> None:
+        """A call ended without telling anything about the dependency"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == BreakerState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != BreakerState.OPEN:
+                metrics.increment(f"{self.name}.breaker_opened")
+            self._opened_at = time.monotonic()
+            self._set_state(BreakerState.OPEN)
+
+
+class TokenBucket:
+    """
+    Async rate limiter with additive-increase/multiplicative-decrease.
+
+    Requests take one token each; tokens refill at ``rate`` per second
+    up to ``capacity``. When the remote side reports throttling the rate
+    is halved, and it then creeps back up to ``max_rate`` on success.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        capacity: float,
+        min_rate: Optional[float] = None,
+    ):
+        self.name = name
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        metrics.set_gauge(f"{self.name}.rate_per_second", self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take a token, waiting if needed; returns seconds waited"""
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self._tokens < 1:
+                metrics.increment(f"{self.name}.throttled")
+            # Loop, as a pause() may push the next token further out
+            while self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= 1
+            return waited
+
+    def on_throttled(self) -> None:
+        """Remote side rejected a request for exceeding its quota"""
+        self.rate = max(self.rate / 2, self.min_rate)
+        self._tokens = 0
+        metrics.increment(f"{self.name}.rate_limited")
+        metrics.set_gauge(f"{self.name}.rate_per_second", self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for ``seconds``, e.g. on a retry-after reply"""
+        self._refill()
+        # Negative balance: the next token is ready only after the pause
+        self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    def on_success(self) -> None:
+        if self.rate < self.max_rate:
+            self.rate = min(self.rate + self.max_rate / 20, self.max_rate)
+            metrics.set_gauge(f"{self.name}.rate_per_second", self.rate)
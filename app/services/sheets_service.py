@@ -1,13 +1,62 @@
+import asyncio
 import json
+import time
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 from loguru import logger
 
+from app.models.money import format_money
 from app.models.order import Order, OrderStatus
+from app.services.metrics_service import metrics
+from app.services.order_id_service import OrderIdAllocator, parse_order_number
+from app.services.resilience import CircuitBreaker, CircuitOpenError, TokenBucket
+
+T = TypeVar("T")
+
+
+class _RemoteBudget:
+    """
+    Timeout of one Sheets operation that only runs while a request is
+    with Google.
+
+    Waiting for the client's call lock or for a token from the bucket is
+    our own pacing, not a slow API, so it neither uses up the budget nor
+    counts as a failure for the circuit breaker.
+    """
+
+    def __init__(self, seconds: float, timeout: asyncio.Timeout):
+        self.remaining = seconds
+        self._timeout = timeout
+        self._started: Optional[float] = None
+
+    def start(self) -> None:
+        self._started = asyncio.get_running_loop().time()
+        self._timeout.reschedule(self._started + self.remaining)
+
+    def stop(self) -> None:
+        if self._started is not None:
+            self.remaining -= asyncio.get_running_loop().time() - self._started
+            self._started = None
+            if not self._timeout.expired():
+                self._timeout.reschedule(None)
+
+
+# Budget of the operation the current task is running, if any
+_remote_budget: ContextVar[Optional[_RemoteBudget]] = ContextVar(
+    "sheets_remote_budget", default=None
+)
+
+
+def _describe(e: BaseException) -> str:
+    """Exception for logs; timeouts have no message of their own"""
+    return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
 
 # Google Sheets imports - may not be available
 try:
+    import gspread
     import gspread_asyncio
     from google.oauth2.service_account import Credentials
 
@@ -20,6 +69,58 @@ except ImportError:
     )
 
 
+if SHEETS_AVAILABLE:
+
+    class MeteredClientManager(gspread_asyncio.AsyncioGspreadClientManager):
+        """
+        Client manager that counts every request sent to Google and paces
+        them with a token bucket. Errors are raised to the caller instead
+        of being retried forever, so a slow or throttling API can't hold
+        up the bot.
+        """
+
+        def __init__(self, credentials_fn, bucket: TokenBucket):
+            super().__init__(credentials_fn)
+            self.bucket = bucket
+
+        async def delay(self):
+            await self.bucket.acquire()
+
+        async def before_gspread_call(self, method, args, kwargs):
+            metrics.increment("sheets.api_calls")
+            metrics.increment(f"sheets.api_calls.{method.__name__}")
+            # Lock and bucket are behind us: from here on it's Google's time
+            budget = _remote_budget.get()
+            if budget is not None:
+                budget.start()
+
+        async def _call(self, method, *args, **kwargs):
+            try:
+                return await super()._call(method, *args, **kwargs)
+            finally:
+                budget = _remote_budget.get()
+                if budget is not None:
+                    budget.stop()
+
+        async def _authorize(self):
+            budget = _remote_budget.get()
+            if budget is not None:
+                budget.start()
+            try:
+                return await super()._authorize()
+            finally:
+                if budget is not None:
+                    budget.stop()
+
+        async def handle_gspread_error(self, e, method, args, kwargs):
+            if e.response.status_code == 429:
+                self.bucket.on_throttled()
+            raise e
+
+        async def handle_requests_error(self, e, method, args, kwargs):
+            raise e
+
+
 class GoogleSheetsService:
     """Async Google Sheets service for order management"""
 
@@ -46,14 +147,53 @@ class GoogleSheetsService:
         "comment",
     ]
 
-    def __init__(self, credentials_path: str, spreadsheet_id: str):
+    def __init__(
+        self,
+        credentials_path: str,
+        spreadsheet_id: str,
+        batch_window: float = 0.5,
+        batch_size: int = 50,
+        requests_per_minute: int = 60,
+        call_timeout: float = 15.0,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+    ):
         self.credentials_path = credentials_path
         self.spreadsheet_id = spreadsheet_id
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.call_timeout = call_timeout
+        self._bucket = TokenBucket(
+            "sheets",
+            rate=requests_per_minute / 60,
+            capacity=max(1, requests_per_minute // 12),
+        )
+        self._breaker = CircuitBreaker(
+            "sheets",
+            failure_threshold=breaker_threshold,
+            reset_timeout=breaker_reset,
+        )
         self._agcm: Optional["gspread_asyncio.AsyncioGspreadClientManager"] = None
+        # Worksheet handles by name, kept until a call through them fails
+        self._worksheets: dict[str, "gspread_asyncio.AsyncioGspreadWorksheet"] = {}
+        # Concurrent first calls must not open (or create) a worksheet twice
+        self._open_lock = asyncio.Lock()
         self._initialized = False
+        # Rows waiting for the next append: (order_id, row, result future)
+        self._pending: list[tuple[str, list[str], asyncio.Future]] = []
+        self._batch_full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        # order_id -> sheet row, None until read from the sheet
+        self._row_index: Optional[dict[str, int]] = None
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether orders can be saved to sheets at all"""
+        return SHEETS_AVAILABLE and bool(self.spreadsheet_id)
 
     def _get_credentials(self) -> "Credentials":
         """Create credentials from service account file"""
+        metrics.increment("sheets.authorizations")
         return Credentials.from_service_account_file(
             self.credentials_path, scopes=self.SCOPES
         )
@@ -66,20 +206,71 @@ class GoogleSheetsService:
             raise RuntimeError("Google Sheets libraries not installed")
 
         if self._agcm is None:
-            self._agcm = gspread_asyncio.AsyncioGspreadClientManager(
-                lambda: self._get_credentials()
-            )
+            self._agcm = self._create_client_manager()
         return self._agcm
 
+    def _create_client_manager(self) -> "MeteredClientManager":
+        return MeteredClientManager(lambda: self._get_credentials(), self._bucket)
+
+    async def _call(self, operation: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """Run a Sheets operation behind the circuit breaker and timeout.
+
+        ``call_timeout`` limits the time the operation's requests spend
+        with Google; queueing for the rate limit is not counted.
+        """
+        if not self._breaker.allow():
+            raise CircuitOpenError("Google Sheets is unavailable, circuit open")
+        try:
+            async with asyncio.timeout(None) as timeout:
+                token = _remote_budget.set(_RemoteBudget(self.call_timeout, timeout))
+                try:
+                    result = await operation(*args)
+                finally:
+                    _remote_budget.reset(token)
+        except asyncio.CancelledError:
+            # The caller gave up, which says nothing about Google
+            self._breaker.release()
+            raise
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        self._bucket.on_success()
+        return result
+
+    def _reset_client(self) -> None:
+        """Drop client and handles after an error, next call starts fresh"""
+        self._agcm = None
+        self._worksheets.clear()
+        self._initialized = False
+        self._row_index = None
+
     async def _get_worksheet(self, sheet_name: str = "Orders"):
-        """Get worksheet by name"""
+        """Get worksheet by name.
+
+        The handle is opened once and reused: the credentials inside it
+        refresh their access token on their own, so later calls go
+        straight to the request they need.
+        """
+        worksheet = self._worksheets.get(sheet_name)
+        if worksheet is not None:
+            return worksheet
+
+        async with self._open_lock:
+            worksheet = self._worksheets.get(sheet_name)
+            if worksheet is None:
+                worksheet = await self._open_worksheet(sheet_name)
+                self._worksheets[sheet_name] = worksheet
+        return worksheet
+
+    async def _open_worksheet(self, sheet_name: str):
         agcm = await self._get_client_manager()
         agc = await agcm.authorize()
         spreadsheet = await agc.open_by_key(self.spreadsheet_id)
 
         try:
             worksheet = await spreadsheet.worksheet(sheet_name)
-        except Exception:
+        except gspread.WorksheetNotFound:
             # Create worksheet if it doesn't exist
             worksheet = await spreadsheet.add_worksheet(
                 title=sheet_name, rows=1000, cols=20
@@ -89,6 +280,14 @@ class GoogleSheetsService:
 
         return worksheet
 
+    def _count_order(self) -> None:
+        """Track how many Google API calls one saved order costs"""
+        metrics.increment("sheets.orders_saved")
+        metrics.set_gauge(
+            "sheets.api_calls_per_order",
+            metrics.counters["sheets.api_calls"] / metrics.counters["sheets.orders_saved"],
+        )
+
     async def _ensure_headers(self, worksheet) -> None:
         """Ensure headers exist in worksheet"""
         if not self._initialized:
@@ -97,8 +296,38 @@ class GoogleSheetsService:
                 await worksheet.insert_row(self.HEADERS, 1)
             self._initialized = True
 
+    def _format_row(self, order: Order) -> list[str]:
+        """Sheet row of an order, in HEADERS order"""
+        items_str = "; ".join(
+            f"{item.name} x{item.quantity} ({format_money(item.subtotal)}€)"
+            for item in order.items
+        )
+
+        return [
+            order.order_id,
+            order.created_at.isoformat(),
+            order.status.value,
+            str(order.user_id),
+            order.username or "",
+            order.customer_name,
+            order.customer_phone,
+            order.delivery_type.value,
+            order.delivery_address or "Самовывоз",
+            order.delivery_time,
+            items_str,
+            format_money(order.subtotal),
+            format_money(order.delivery_fee),
+            format_money(order.total),
+            order.comment or "",
+        ]
+
     async def save_order(self, order: Order) -> bool:
-        """Save order to Google Sheets"""
+        """Save order to Google Sheets.
+
+        The row is queued and written together with other orders
+        confirmed around the same time; the call returns once its batch
+        has been appended (or has failed).
+        """
         if not SHEETS_AVAILABLE:
             logger.warning("Google Sheets not available, order not saved")
             return False
@@ -108,74 +337,221 @@ class GoogleSheetsService:
             return False
 
         try:
-            worksheet = await self._get_worksheet()
-            await self._ensure_headers(worksheet)
+            row = self._format_row(order)
+        except Exception as e:
+            logger.error(f"Error formatting order {order.order_id} for sheets: {e}")
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((order.order_id, row, future))
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
 
-            # Format items for storage
-            items_str = "; ".join(
-                f"{item.name} x{item.quantity} ({item.subtotal}€)"
-                for item in order.items
+        return await asyncio.shield(future)
+
+    async def _flush(self) -> None:
+        """Write queued rows once the window passes or a batch is full"""
+        try:
+            await asyncio.wait_for(self._batch_full.wait(), self.batch_window)
+        except asyncio.TimeoutError:
+            pass
+
+        # Rows queued while a batch is being written go out right after it
+        while self._pending:
+            self._batch_full.clear()
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            await self._append_batch(batch)
+
+    async def _append_batch(
+        self, batch: list[tuple[str, list[str], asyncio.Future]]
+    ) -> None:
+        """Append rows with one API call and resolve each order's result"""
+        started = time.perf_counter()
+        metrics.observe("sheets.batch_size", len(batch))
+
+        try:
+            response = await self._call(
+                self._append_rows,
+                [order_id for order_id, _, _ in batch],
+                [row for _, row, _ in batch],
+            )
+        except CircuitOpenError as e:
+            logger.warning(f"{len(batch)} order(s) not saved: {e}")
+            appended = 0
+        except Exception as e:
+            logger.error(f"Error saving {len(batch)} order(s) to sheets: {_describe(e)}")
+            self._reset_client()
+            appended = 0
+        else:
+            # Rows are appended in order, so if the sheet took fewer rows
+            # than sent, the missing ones are at the end
+            appended = (response or {}).get("updates", {}).get(
+                "updatedRows", len(batch)
             )
+        finally:
+            metrics.observe("sheets.flush_seconds", time.perf_counter() - started)
 
-            row = [
-                order.order_id,
-                order.created_at.isoformat(),
-                order.status.value,
-                str(order.user_id),
-                order.username or "",
-                order.customer_name,
-                order.customer_phone,
-                order.delivery_type.value,
-                order.delivery_address or "Самовывоз",
-                order.delivery_time,
-                items_str,
-                str(order.subtotal),
-                str(order.delivery_fee),
-                str(order.total),
-                order.comment or "",
-            ]
-
-            await worksheet.append_row(row)
-            logger.info(f"Order {order.order_id} saved to Google Sheets")
-            return True
+        for position, (order_id, _, future) in enumerate(batch):
+            saved = position < appended
+            if saved:
+                self._count_order()
+            else:
+                logger.warning(f"Order {order_id} was not saved to Google Sheets")
+            if not future.done():
+                future.set_result(saved)
+
+        if appended:
+            logger.info(
+                f"Saved {appended} order(s) to Google Sheets: "
+                f"{', '.join(order_id for order_id, _, _ in batch[:appended])}"
+            )
+
+    async def _append_rows(self, order_ids: list[str], rows: list[list[str]]) -> dict:
+        worksheet = await self._get_worksheet()
+        await self._ensure_headers(worksheet)
+        response = await worksheet.append_rows(rows)
+        self._index_appended_rows(order_ids, response)
+        return response
+
+    async def close(self) -> None:
+        """Write rows that are still queued"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._batch_full.set()
+            await self._flush_task
+
+    async def get_last_order_number(self, day: str) -> Optional[int]:
+        """Highest order number saved for a day (YYYYMMDD), 0 if none.
+
+        Reads the whole ID column, so use it to seed a local sequence
+        once rather than per order. None if the sheet can't be read.
+        """
+        if not SHEETS_AVAILABLE or not self.spreadsheet_id:
+            return None
 
+        try:
+            all_values = await self._call(self._read_order_ids)
+        except CircuitOpenError as e:
+            logger.warning(f"Order IDs not read: {e}")
+            return None
         except Exception as e:
-            logger.error(f"Error saving order to sheets: {e}")
-            return False
+            logger.error(f"Error reading order IDs from sheets: {_describe(e)}")
+            self._reset_client()
+            return None
+
+        numbers = (parse_order_number(value, day) for value in all_values)
+        return max((n for n in numbers if n is not None), default=0)
+
+    async def _read_order_ids(self) -> list[str]:
+        worksheet = await self._get_worksheet()
+        return await worksheet.col_values(1)
 
     async def get_next_order_id(self) -> str:
-        """Generate next order ID"""
-        today = datetime.now().strftime("%Y%m%d")
-        prefix = f"ORD-{today}-"
+        """Generate next order ID from the sheet contents"""
+        day = OrderIdAllocator.today()
+        last = await self.get_last_order_number(day)
 
-        if not SHEETS_AVAILABLE or not self.spreadsheet_id:
+        if last is None:
             # Fallback to timestamp-based ID
-            return f"{prefix}{datetime.now().strftime('%H%M%S')}"
+            return f"{OrderIdAllocator.PREFIX}-{day}-{datetime.now().strftime('%H%M%S')}"
+        return OrderIdAllocator.format_id(day, last + 1)
+
+    def _index_appended_rows(self, order_ids: list[str], response: dict) -> None:
+        """Record rows of freshly appended orders from the API response"""
+        if self._row_index is None:
+            # Built from the sheet on first use, which covers these rows too
+            return
+        updated_range = (response or {}).get("updates", {}).get("updatedRange")
+        if not updated_range:
+            self._row_index = None
+            return
+        # e.g. "Orders!A12:O19" -> first row 12
+        first_cell = updated_range.split("!")[-1].split(":")[0]
+        first_row, _ = gspread.utils.a1_to_rowcol(first_cell)
+        for offset, order_id in enumerate(order_ids):
+            self._row_index[order_id] = first_row + offset
+
+    async def _rebuild_row_index(self, worksheet) -> dict[str, int]:
+        """Read the ID column once and map every order to its row"""
+        values = await worksheet.col_values(1)
+        self._row_index = {
+            value: row for row, value in enumerate(values, start=1) if value
+        }
+        return self._row_index
+
+    async def _find_rows(self, worksheet, order_ids: list[str]) -> dict[str, int]:
+        """Rows of the given orders, checked against the sheet.
+
+        Rows come from the index; one small read confirms that each row
+        still holds its order (the sheet may have been sorted or edited
+        by hand). Missing or moved orders trigger one index rebuild.
+        """
+        index = self._row_index
+        rebuilt = False
+        if index is None:
+            index = await self._rebuild_row_index(worksheet)
+            rebuilt = True
+
+        while True:
+            rows = {
+                order_id: index[order_id] for order_id in order_ids if order_id in index
+            }
+            found = {}
+            if rows:
+                values = await worksheet.batch_get([f"A{row}" for row in rows.values()])
+                for (order_id, row), value in zip(rows.items(), values):
+                    if value and value[0] and value[0][0] == order_id:
+                        found[order_id] = row
+
+            if len(found) == len(order_ids) or rebuilt:
+                return found
+            index = await self._rebuild_row_index(worksheet)
+            rebuilt = True
+
+    async def _write_statuses(self, statuses: dict[str, OrderStatus]) -> dict[str, int]:
+        worksheet = await self._get_worksheet()
+        rows = await self._find_rows(worksheet, list(statuses))
+        # Status is column C = 3
+        if len(rows) == 1:
+            ((order_id, row),) = rows.items()
+            await worksheet.update_cell(row, 3, statuses[order_id].value)
+        elif rows:
+            await worksheet.batch_update(
+                [
+                    {"range": f"C{row}", "values": [[statuses[order_id].value]]}
+                    for order_id, row in rows.items()
+                ]
+            )
+        return rows
 
-        try:
-            worksheet = await self._get_worksheet()
-            all_values = await worksheet.col_values(1)
-
-            # Find today's orders
-            today_orders = [v for v in all_values if v.startswith(prefix)]
-
-            if today_orders:
-                numbers = []
-                for o in today_orders:
-                    try:
-                        num = int(o.split("-")[-1])
-                        numbers.append(num)
-                    except ValueError:
-                        continue
-                next_num = max(numbers) + 1 if numbers else 1
-            else:
-                next_num = 1
+    async def update_order_statuses(
+        self,
+        statuses: dict[str, OrderStatus],
+    ) -> dict[str, bool]:
+        """Update status of several orders at once.
 
-            return f"{prefix}{next_num:03d}"
+        Returns per order whether its row was found and updated.
+        """
+        result = {order_id: False for order_id in statuses}
+        if not SHEETS_AVAILABLE or not self.spreadsheet_id or not statuses:
+            return result
 
+        try:
+            rows = await self._call(self._write_statuses, statuses)
+        except CircuitOpenError as e:
+            logger.warning(f"Order status not updated: {e}")
+            return result
         except Exception as e:
-            logger.error(f"Error generating order ID: {e}")
-            return f"{prefix}{datetime.now().strftime('%H%M%S')}"
+            logger.error(f"Error updating order status: {_describe(e)}")
+            self._reset_client()
+            return result
+
+        for order_id in rows:
+            result[order_id] = True
+            logger.info(f"Order {order_id} status updated to {statuses[order_id].value}")
+        return result
 
     async def update_order_status(
         self,
@@ -183,21 +559,5 @@ class GoogleSheetsService:
         status: OrderStatus,
     ) -> bool:
         """Update order status (for future admin bot)"""
-        if not SHEETS_AVAILABLE or not self.spreadsheet_id:
-            return False
-
-        try:
-            worksheet = await self._get_worksheet()
-            cell = await worksheet.find(order_id)
-
-            if not cell:
-                return False
-
-            # Update status (column C = 3)
-            await worksheet.update_cell(cell.row, 3, status.value)
-            logger.info(f"Order {order_id} status updated to {status.value}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error updating order status: {e}")
-            return False
+        result = await self.update_order_statuses({order_id: status})
+        return result[order_id]
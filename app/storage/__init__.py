@@ -0,0 +1,3 @@
+from app.storage.sqlite_storage import SqliteStorage
+
+__all__ = ["SqliteStorage"]
@@ -0,0 +1,121 @@
+from typing import Any, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import DefaultKeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import WatchError
+
+
+class SharedRedisStorage(RedisStorage):
+    """
+    Redis FSM storage that several bot workers can share.
+
+    Compared to aiogram's ``RedisStorage``:
+
+    - ``update_data`` is an optimistic WATCH/MULTI transaction, so two
+      workers updating the same user never lose each other's changes;
+    - state and data writes refresh both TTLs in one pipelined round
+      trip, so an active session never half-expires;
+    - ``get_state_and_data`` reads both parts in a single round trip.
+
+    Any client speaking the Redis protocol works, including
+    ``fakeredis.FakeAsyncRedis`` for local runs.
+    """
+
+    MAX_UPDATE_RETRIES = 50
+
+    def __init__(self, redis: Redis, session_ttl: Optional[int] = None, **kwargs: Any):
+        kwargs.setdefault("state_ttl", session_ttl)
+        kwargs.setdefault("data_ttl", session_ttl)
+        super().__init__(redis=redis, **kwargs)
+
+    @classmethod
+    def from_settings(
+        cls,
+        url: str,
+        prefix: str,
+        session_ttl: Optional[int],
+        max_connections: int,
+    ) -> "SharedRedisStorage":
+        """Create storage with a bounded connection pool"""
+        pool = ConnectionPool.from_url(url, max_connections=max_connections)
+        return cls(
+            redis=Redis(connection_pool=pool),
+            key_builder=DefaultKeyBuilder(
+                prefix=prefix, with_bot_id=True, with_destiny=True
+            ),
+            session_ttl=session_ttl or None,
+        )
+
+    def _decode_data(self, value: Any) -> dict[str, Any]:
+        if value is None:
+            return {}
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return self.json_loads(value)
+
+    async def get_state_and_data(
+        self, key: StorageKey
+    ) -> tuple[Optional[str], dict[str, Any]]:
+        """Read state and data in one round trip"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self.key_builder.build(key, "state"))
+            pipe.get(self.key_builder.build(key, "data"))
+            state, data = await pipe.execute()
+        if isinstance(state, bytes):
+            state = state.decode("utf-8")
+        return state, self._decode_data(data)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state_key = self.key_builder.build(key, "state")
+        data_key = self.key_builder.build(key, "data")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if state is None:
+                pipe.delete(state_key)
+            else:
+                pipe.set(
+                    state_key,
+                    state.state if isinstance(state, State) else state,
+                    ex=self.state_ttl,
+                )
+            if self.data_ttl:
+                pipe.expire(data_key, self.data_ttl)
+            await pipe.execute()
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        state_key = self.key_builder.build(key, "state")
+        data_key = self.key_builder.build(key, "data")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if data:
+                pipe.set(data_key, self.json_dumps(data), ex=self.data_ttl)
+            else:
+                pipe.delete(data_key)
+            if self.state_ttl:
+                pipe.expire(state_key, self.state_ttl)
+            await pipe.execute()
+
+    async def update_data(
+        self, key: StorageKey, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        data_key = self.key_builder.build(key, "data")
+
+        for _ in range(self.MAX_UPDATE_RETRIES):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(data_key)
+                    current = self._decode_data(await pipe.get(data_key))
+                    current.update(data)
+
+                    pipe.multi()
+                    if current:
+                        pipe.set(data_key, self.json_dumps(current), ex=self.data_ttl)
+                    else:
+                        pipe.delete(data_key)
+                    await pipe.execute()
+                    return current.copy()
+                except WatchError:
+                    # Another worker changed the data between WATCH and EXEC
+                    continue
+
+        raise RuntimeError(f"Too much contention updating FSM data for {data_key}")
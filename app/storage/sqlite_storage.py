@@ -0,0 +1,237 @@
+import asyncio
+import json
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (
+    BaseStorage,
+    DefaultKeyBuilder,
+    KeyBuilder,
+    StateType,
+    StorageKey,
+)
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class _Record:
+    """State and data of one FSM key"""
+
+    __slots__ = ("state", "data")
+
+    def __init__(self, state: Optional[str] = None, data: Optional[dict] = None):
+        self.state = state
+        self.data = data if data is not None else {}
+
+
+class SqliteStorage(BaseStorage):
+    """
+    Persistent FSM storage backed by a local SQLite database.
+
+    Reads go through an in-memory LRU cache; writes land in the cache
+    immediately and are committed to disk in batches, at most
+    ``flush_interval`` seconds after the first pending change. The
+    database runs in WAL mode, so a crash loses at most one batch.
+
+    All database work happens in a single dedicated thread, so the
+    event loop never waits on disk I/O.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        cache_size: int = 10_000,
+        max_batch: int = 500,
+        key_builder: Optional[KeyBuilder] = None,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self.max_batch = max_batch
+        self.key_builder = key_builder or DefaultKeyBuilder(
+            with_bot_id=True, with_destiny=True
+        )
+
+        # Records with changes not yet committed; never evicted
+        self._dirty: dict[str, _Record] = {}
+        # Clean records, least recently used first
+        self._cache: OrderedDict[str, _Record] = OrderedDict()
+
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fsm-sqlite"
+        )
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open database and create schema"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS fsm ("
+            "key TEXT PRIMARY KEY, state TEXT, data TEXT NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking database call in the storage thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    # ---------- Database thread ----------
+
+    def _load_row(self, key: str) -> _Record:
+        row = self._conn.execute(
+            "SELECT state, data FROM fsm WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return _Record()
+        return _Record(row[0], json.loads(row[1]))
+
+    def _write_rows(
+        self, upserts: list[tuple[str, Optional[str], str]], deletes: list[str]
+    ) -> None:
+        with self._conn:
+            if upserts:
+                self._conn.executemany(
+                    "INSERT INTO fsm (key, state, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET "
+                    "state = excluded.state, data = excluded.data",
+                    upserts,
+                )
+            if deletes:
+                self._conn.executemany(
+                    "DELETE FROM fsm WHERE key = ?", [(k,) for k in deletes]
+                )
+
+    # ---------- Cache ----------
+
+    async def _get_record(self, key: StorageKey) -> tuple[str, _Record]:
+        """Find record in cache or load it from the database"""
+        db_key = self.key_builder.build(key)
+
+        record = self._dirty.get(db_key)
+        if record is not None:
+            return db_key, record
+
+        record = self._cache.get(db_key)
+        if record is not None:
+            self._cache.move_to_end(db_key)
+            return db_key, record
+
+        loaded = await self._run(self._load_row, db_key)
+
+        # Another coroutine may have loaded or changed the key meanwhile
+        record = self._dirty.get(db_key) or self._cache.get(db_key)
+        if record is not None:
+            return db_key, record
+
+        self._cache[db_key] = loaded
+        self._evict()
+        return db_key, loaded
+
+    def _evict(self) -> None:
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _mark_dirty(self, db_key: str, record: _Record) -> None:
+        """Queue record for the next batch commit"""
+        self._cache.pop(db_key, None)
+        self._dirty[db_key] = record
+
+        if len(self._dirty) >= self.max_batch:
+            if self._batch_task is None or self._batch_task.done():
+                self._batch_task = asyncio.create_task(self.flush())
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Commit all pending changes to disk"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            batch, self._dirty = self._dirty, {}
+
+            # Serialize on the loop, so later changes to the same record
+            # can't race with the database thread
+            upserts = []
+            deletes = []
+            for db_key, record in batch.items():
+                if record.state is None and not record.data:
+                    deletes.append(db_key)
+                else:
+                    upserts.append((db_key, record.state, json.dumps(record.data)))
+
+            try:
+                await self._run(self._write_rows, upserts, deletes)
+            except Exception as e:
+                logger.error(f"FSM storage flush failed, will retry: {e}")
+                for db_key, record in batch.items():
+                    self._dirty.setdefault(db_key, record)
+                if self._flush_task is None:
+                    self._flush_task = asyncio.create_task(self._flush_later())
+                return
+
+            for db_key, record in batch.items():
+                if db_key not in self._dirty:
+                    self._cache[db_key] = record
+            self._evict()
+
+    # ---------- BaseStorage ----------
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        db_key, record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._mark_dirty(db_key, record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        _, record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        db_key, record = await self._get_record(key)
+        record.data = data.copy()
+        self._mark_dirty(db_key, record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        _, record = await self._get_record(key)
+        return record.data.copy()
+
+    async def update_data(
+        self, key: StorageKey, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        db_key, record = await self._get_record(key)
+        record.data = {**record.data, **data}
+        self._mark_dirty(db_key, record)
+        return record.data.copy()
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._batch_task is not None:
+            await asyncio.gather(self._batch_task, return_exceptions=True)
+        await self.flush()
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
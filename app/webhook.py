@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import signal
+import socket
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+from loguru import logger
+
+from app.services.metrics_service import metrics
+from config import Settings
+
+
+class WebhookRequestHandler(SimpleRequestHandler):
+    """
+    Webhook handler with bounded concurrency, health check and draining.
+
+    Updates are acknowledged to Telegram right away and processed in
+    background tasks. At most ``max_concurrency`` updates are processed
+    at once; further requests wait for a free slot, which holds the
+    connection open and makes Telegram slow down.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: str,
+        max_concurrency: int,
+        **data: Any,
+    ):
+        super().__init__(
+            dispatcher=dispatcher,
+            bot=bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.draining = False
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self.draining:
+            # Telegram retries the update, another worker will take it
+            return web.Response(status=503, text="Shutting down")
+        return await super().handle(request)
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        update = await request.json(loads=bot.session.json_loads)
+        await self._slots.acquire()
+
+        task = asyncio.create_task(self._background_feed_update(bot=bot, update=update))
+        self._background_feed_update_tasks.add(task)
+        task.add_done_callback(self._background_feed_update_tasks.discard)
+        task.add_done_callback(lambda _: self._slots.release())
+
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def health(self, request: web.Request) -> web.Response:
+        """Health check for the load balancer"""
+        return web.json_response(
+            {
+                "status": "draining" if self.draining else "ok",
+                "in_flight": len(self._background_feed_update_tasks),
+            },
+            status=503 if self.draining else 200,
+        )
+
+    async def show_metrics(self, request: web.Request) -> web.Response:
+        """Counters and latency histograms of this worker"""
+        return web.json_response(metrics.snapshot())
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting updates and wait for in-flight ones"""
+        self.draining = True
+        tasks = set(self._background_feed_update_tasks)
+        if not tasks:
+            return
+
+        logger.info(f"Draining {len(tasks)} in-flight update(s)...")
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logger.warning(f"{len(pending)} update(s) still running after {timeout}s")
+
+
+def get_webhook_secret(settings: Settings) -> str:
+    """Configured secret, or one derived from the bot token.
+
+    The derived value is the same on every worker, so several processes
+    can share one webhook without extra configuration.
+    """
+    if settings.webhook_secret:
+        return settings.webhook_secret
+    return hashlib.sha256(settings.bot_token.encode()).hexdigest()[:32]
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, settings: Settings) -> None:
+    """Serve updates over an embedded aiohttp server until SIGTERM"""
+    if not settings.webhook_base_url:
+        raise RuntimeError("WEBHOOK_BASE_URL is required in webhook mode")
+
+    secret = get_webhook_secret(settings)
+    webhook_url = settings.webhook_base_url.rstrip("/") + settings.webhook_path
+
+    app = web.Application()
+    handler = WebhookRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=secret,
+        max_concurrency=settings.webhook_max_concurrency,
+    )
+    handler.register(app, path=settings.webhook_path)
+    app.router.add_get(settings.health_path, handler.health)
+    app.router.add_get(settings.metrics_path, handler.show_metrics)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(
+        runner,
+        host=settings.webhook_host,
+        port=settings.webhook_port,
+        # Lets several worker processes listen on the same port
+        reuse_port=hasattr(socket, "SO_REUSEPORT"),
+    )
+    await site.start()
+    logger.info(
+        f"Listening on {settings.webhook_host}:{settings.webhook_port}, "
+        f"up to {settings.webhook_max_concurrency} concurrent updates"
+    )
+
+    await bot.set_webhook(
+        url=webhook_url,
+        secret_token=secret,
+        allowed_updates=dp.resolve_used_update_types(),
+        max_connections=min(settings.webhook_max_concurrency, 100),
+    )
+    logger.info(f"Webhook set: {webhook_url}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows: fall back to KeyboardInterrupt
+            pass
+
+    try:
+        await stop.wait()
+        logger.info("Shutdown signal received")
+        await handler.drain(settings.webhook_drain_timeout)
+    finally:
+        # Runs dispatcher shutdown (storage close) and closes bot session
+        await runner.cleanup()
@@ -0,0 +1,126 @@
+"""
+Compare the compact cart with the pydantic cart it replaced.
+
+One cycle is what a cart button does: rebuild the cart from stored
+FSM data, change one quantity, read total and item count for the
+keyboard, and turn the cart back into storable data. Also reports
+the JSON size of the stored cart, which is what goes to SQLite/Redis.
+
+Usage:
+    python benchmarks/cart_bench.py [--lines 5] [--cycles 20000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import BaseModel
+
+from app.models.cart import Cart
+from app.services.menu_service import MenuService
+
+
+class LegacyCartItem(BaseModel):
+    """Cart line as it was stored before (full copy of the menu item)"""
+
+    item_id: str
+    name: str
+    price: float
+    quantity: int
+
+    @property
+    def subtotal(self) -> float:
+        return self.price * self.quantity
+
+
+class LegacyCart(BaseModel):
+    user_id: int
+    items: dict[str, LegacyCartItem] = {}
+    created_at: datetime = datetime.now()
+    updated_at: datetime = datetime.now()
+
+    @property
+    def total(self) -> float:
+        return sum(item.subtotal for item in self.items.values())
+
+    @property
+    def item_count(self) -> int:
+        return sum(item.quantity for item in self.items.values())
+
+    def increment_item(self, item_id: str) -> None:
+        if item_id in self.items:
+            self.items[item_id].quantity += 1
+            self.updated_at = datetime.now()
+
+
+def legacy_cycle(stored: dict, item_id: str) -> dict:
+    cart = LegacyCart(
+        user_id=1,
+        items={k: LegacyCartItem(**v) for k, v in stored.get("items", {}).items()},
+    )
+    cart.increment_item(item_id)
+    cart.total, cart.item_count
+    return {
+        "user_id": cart.user_id,
+        "items": {k: v.model_dump() for k, v in cart.items.items()},
+    }
+
+
+def compact_cycle(stored: dict, item_id: str, menu) -> dict:
+    cart = Cart(1, menu, "fr", stored)
+    cart.increment_item(item_id)
+    cart.total, cart.item_count
+    return cart.to_quantities()
+
+
+def measure(fn, cycles: int) -> float:
+    """Microseconds per cycle"""
+    start = time.perf_counter()
+    for _ in range(cycles):
+        fn()
+    return (time.perf_counter() - start) / cycles * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=5, help="distinct items in the cart")
+    parser.add_argument("--cycles", type=int, default=20000)
+    args = parser.parse_args()
+
+    menu_path = Path(__file__).parent.parent / "data" / "menu.json"
+    snapshot = MenuService(str(menu_path)).get_snapshot()
+    items = list(snapshot.items_by_id.values())[: args.lines]
+    if not items:
+        sys.exit("menu has no items")
+
+    legacy = LegacyCart(user_id=1)
+    for item in items:
+        legacy.items[item.id] = LegacyCartItem(
+            item_id=item.id, name=item.get_name("fr"), price=item.price, quantity=2
+        )
+    legacy_stored = {
+        "user_id": legacy.user_id,
+        "items": {k: v.model_dump() for k, v in legacy.items.items()},
+    }
+    compact_stored = {item.id: 2 for item in items}
+    target = items[0].id
+
+    legacy_us = measure(lambda: legacy_cycle(legacy_stored, target), args.cycles)
+    compact_us = measure(lambda: compact_cycle(compact_stored, target, snapshot), args.cycles)
+    legacy_bytes = len(json.dumps(legacy_stored, ensure_ascii=False).encode())
+    compact_bytes = len(json.dumps(compact_stored, ensure_ascii=False).encode())
+
+    print(f"cart with {len(items)} lines, {args.cycles} cycles")
+    print(f"{'':10} {'us/cycle':>10} {'stored bytes':>14}")
+    print(f"{'pydantic':10} {legacy_us:>10.1f} {legacy_bytes:>14}")
+    print(f"{'compact':10} {compact_us:>10.1f} {compact_bytes:>14}")
+    print(f"speedup {legacy_us / compact_us:.1f}x, state {legacy_bytes / compact_bytes:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
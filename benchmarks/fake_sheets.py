@@ -0,0 +1,219 @@
+"""
+In-process stand-in for the Google Sheets API.
+
+Fakes the synchronous gspread objects (client, spreadsheet, worksheet)
+for the calls GoogleSheetsService makes, so the real gspread_asyncio
+wrappers, rate limiter, breaker and metrics all run unchanged. Every
+call sleeps for the configured latency in the gspread_asyncio worker
+thread, like an HTTP request would, and can fail on purpose.
+
+    backend = FakeSheetsBackend(latency=0.15, error_rate=0.02)
+    service = FakeSheetsService(backend, batch_window=0.5)
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import gspread
+import gspread_asyncio
+from gspread.utils import a1_to_rowcol
+from requests import Response
+
+from app.services.sheets_service import GoogleSheetsService, MeteredClientManager
+
+
+def _api_error(status: int, message: str) -> gspread.exceptions.APIError:
+    response = Response()
+    response.status_code = status
+    response._content = json.dumps(
+        {"error": {"code": status, "message": message}}
+    ).encode()
+    return gspread.exceptions.APIError(response)
+
+
+class FakeSheetsBackend:
+    """Shared state and fault injection of the fake API"""
+
+    def __init__(
+        self,
+        latency: float = 0.1,
+        jitter: float = 0.05,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        quota_per_minute: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.quota_per_minute = quota_per_minute
+        self.sheets: dict[str, list[list[str]]] = {}
+        self.calls: dict[str, int] = {}
+        self._recent: deque[float] = deque()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def request(self, name: str) -> None:
+        """Account for one API request: quota, latency, injected errors"""
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            over_quota = (
+                self.quota_per_minute is not None
+                and len(self._recent) >= self.quota_per_minute
+            )
+            self._recent.append(now)
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.error_rate
+
+        time.sleep(delay)
+        if over_quota:
+            raise _api_error(429, "Quota exceeded for quota metric 'Write requests'")
+        if fail:
+            raise _api_error(self.error_status, "Injected failure")
+
+
+class FakeWorksheet:
+    def __init__(self, backend: FakeSheetsBackend, title: str, index: int):
+        self.backend = backend
+        self.title = title
+        self.id = index
+        self._properties = {"title": title, "index": index, "sheetId": index}
+
+    @property
+    def _rows(self) -> list[list[str]]:
+        return self.backend.sheets[self.title]
+
+    def append_row(self, values, **kwargs) -> dict:
+        return self.append_rows([values], **kwargs)
+
+    def append_rows(self, values, **kwargs) -> dict:
+        self.backend.request("append_rows")
+        with self.backend._lock:
+            first = len(self._rows) + 1
+            self._rows.extend([str(v) for v in row] for row in values)
+            last = len(self._rows)
+        return {
+            "updates": {
+                "updatedRange": f"{self.title}!A{first}:O{last}",
+                "updatedRows": len(values),
+            }
+        }
+
+    def insert_row(self, values, index: int = 1, **kwargs) -> dict:
+        self.backend.request("insert_row")
+        with self.backend._lock:
+            self._rows.insert(index - 1, [str(v) for v in values])
+        return {}
+
+    def row_values(self, row: int, **kwargs) -> list[str]:
+        self.backend.request("row_values")
+        return list(self._rows[row - 1]) if row <= len(self._rows) else []
+
+    def col_values(self, col: int, **kwargs) -> list[str]:
+        self.backend.request("col_values")
+        return [row[col - 1] if len(row) >= col else "" for row in self._rows]
+
+    def find(self, query: str, **kwargs) -> Optional[gspread.Cell]:
+        # Like gspread: downloads all values and searches them locally
+        self.backend.request("find")
+        for r, row in enumerate(self._rows, start=1):
+            for c, value in enumerate(row, start=1):
+                if value == query:
+                    return gspread.Cell(r, c, value)
+        return None
+
+    def update_cell(self, row: int, col: int, value) -> dict:
+        self.backend.request("update_cell")
+        self._set(row, col, value)
+        return {}
+
+    def batch_get(self, ranges: list[str], **kwargs) -> list[list[list[str]]]:
+        self.backend.request("batch_get")
+        result = []
+        for a1 in ranges:
+            row, col = a1_to_rowcol(a1)
+            cells = self._rows[row - 1] if row <= len(self._rows) else []
+            result.append([[cells[col - 1]]] if len(cells) >= col else [])
+        return result
+
+    def batch_update(self, data: list[dict], **kwargs) -> dict:
+        self.backend.request("batch_update")
+        for update in data:
+            row, col = a1_to_rowcol(update["range"])
+            self._set(row, col, update["values"][0][0])
+        return {}
+
+    def _set(self, row: int, col: int, value) -> None:
+        with self.backend._lock:
+            cells = self._rows[row - 1]
+            cells.extend([""] * (col - len(cells)))
+            cells[col - 1] = str(value)
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend: FakeSheetsBackend, key: str):
+        self.backend = backend
+        self.id = key
+        self.title = f"fake-{key}"
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self.backend.request("worksheet")
+        if title not in self.backend.sheets:
+            raise gspread.WorksheetNotFound(title)
+        return FakeWorksheet(self.backend, title, list(self.backend.sheets).index(title))
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index=None) -> FakeWorksheet:
+        self.backend.request("add_worksheet")
+        self.backend.sheets.setdefault(title, [])
+        return FakeWorksheet(self.backend, title, list(self.backend.sheets).index(title))
+
+
+class FakeClient:
+    def __init__(self, backend: FakeSheetsBackend):
+        self.backend = backend
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        self.backend.request("open_by_key")
+        return FakeSpreadsheet(self.backend, key)
+
+
+class FakeClientManager(MeteredClientManager):
+    """Client manager that talks to the fake backend instead of Google"""
+
+    def __init__(self, backend: FakeSheetsBackend, bucket):
+        super().__init__(lambda: None, bucket)
+        self.backend = backend
+        self._client: Optional[gspread_asyncio.AsyncioGspreadClient] = None
+
+    async def authorize(self) -> gspread_asyncio.AsyncioGspreadClient:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        if self._client is None:
+            self._client = gspread_asyncio.AsyncioGspreadClient(
+                self, FakeClient(self.backend)
+            )
+        return self._client
+
+
+class FakeSheetsService(GoogleSheetsService):
+    """GoogleSheetsService wired to a FakeSheetsBackend"""
+
+    def __init__(self, backend: FakeSheetsBackend, **kwargs):
+        super().__init__(
+            credentials_path="",
+            spreadsheet_id="fake-spreadsheet",
+            **kwargs,
+        )
+        self.backend = backend
+
+    def _create_client_manager(self) -> FakeClientManager:
+        return FakeClientManager(self.backend, self._bucket)
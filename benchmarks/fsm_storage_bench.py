@@ -0,0 +1,123 @@
+"""
+Compare FSM storages on get_data / update_data throughput.
+
+Usage:
+    python benchmarks/fsm_storage_bench.py [--users 1000] [--ops 20000]
+                                           [--redis-url redis://localhost:6379/15]
+
+The Redis storage is measured against --redis-url when given, otherwise
+against fakeredis if it is installed.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.storage import SqliteStorage
+
+BOT_ID = 42
+
+SAMPLE_DATA = {
+    "lang": "fr",
+    "cart": {"set_002": 2, "set_003": 1},
+    "viewing_item_id": "set_002",
+    "viewing_item_qty": 1,
+}
+
+
+def make_keys(users: int) -> list[StorageKey]:
+    return [StorageKey(bot_id=BOT_ID, chat_id=i, user_id=i) for i in range(1, users + 1)]
+
+
+async def run_ops(storage: BaseStorage, keys: list[StorageKey], ops: int) -> dict:
+    """Measure get_data and update_data rates on pre-populated keys"""
+    for key in keys:
+        await storage.set_data(key, SAMPLE_DATA)
+    if hasattr(storage, "flush"):
+        await storage.flush()
+
+    picks = [random.choice(keys) for _ in range(ops)]
+
+    start = time.perf_counter()
+    for key in picks:
+        await storage.get_data(key)
+    get_rate = ops / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i, key in enumerate(picks):
+        await storage.update_data(key, {"viewing_item_qty": i % 99})
+    update_rate = ops / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    if hasattr(storage, "flush"):
+        await storage.flush()
+    flush_ms = (time.perf_counter() - start) * 1000
+
+    return {"get": get_rate, "update": update_rate, "flush_ms": flush_ms}
+
+
+async def make_redis_storage(url: str | None):
+    """Shared Redis storage on a real server or an in-process fake"""
+    from app.storage.redis_storage import SharedRedisStorage
+
+    if url:
+        storage = SharedRedisStorage.from_settings(
+            url=url, prefix="bench_fsm", session_ttl=3600, max_connections=10
+        )
+        await storage.redis.flushdb()
+        return storage, "redis"
+
+    try:
+        import fakeredis
+    except ImportError:
+        return None, None
+    return SharedRedisStorage(fakeredis.FakeAsyncRedis(), session_ttl=3600), "fakeredis"
+
+
+async def main(users: int, ops: int, redis_url: str | None) -> None:
+    keys = make_keys(users)
+    results = {}
+
+    results["memory"] = await run_ops(MemoryStorage(), keys, ops)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cache large enough for every user: steady-state hot path
+        storage = SqliteStorage(str(Path(tmp) / "warm.sqlite3"))
+        results["sqlite (warm)"] = await run_ops(storage, keys, ops)
+        await storage.close()
+
+        # Tiny cache: most reads go to disk
+        storage = SqliteStorage(str(Path(tmp) / "cold.sqlite3"), cache_size=users // 10)
+        results["sqlite (10% cache)"] = await run_ops(storage, keys, ops)
+        await storage.close()
+
+    storage, name = await make_redis_storage(redis_url)
+    if storage is not None:
+        results[name] = await run_ops(storage, keys, ops)
+        await storage.close()
+
+    print(f"{users} users, {ops} ops per operation\n")
+    print(f"{'storage':<22}{'get_data/s':>14}{'update_data/s':>16}{'final flush':>14}")
+    for name, r in results.items():
+        print(
+            f"{name:<22}{r['get']:>14,.0f}{r['update']:>16,.0f}"
+            f"{r['flush_ms']:>12.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.ops, args.redis_url))
@@ -0,0 +1,93 @@
+"""
+get_text throughput before and after the compiled translation catalog.
+
+Replays the get_text calls of one order summary render (a dozen keys,
+most of them with arguments) across all languages, with the previous
+lookup-and-format implementation as the baseline.
+
+Usage:
+    python benchmarks/i18n_bench.py [--renders 20000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.i18n.translations import DEFAULT_LANGUAGE, LANGUAGES, TEXTS, get_text
+
+# (key, kwargs) pairs of format_order_summary plus the cart text
+CALLS = [
+    ("order_confirmation_title", {}),
+    ("name", {}),
+    ("phone", {}),
+    ("type", {}),
+    ("delivery", {}),
+    ("address", {}),
+    ("time", {}),
+    ("comment", {}),
+    ("order", {}),
+    ("subtotal", {}),
+    ("delivery_fee", {}),
+    ("total", {}),
+    ("category_title", {"emoji": "🍣", "name": "Rolls"}),
+    ("added_to_cart", {"name": "GUNKAN", "quantity": 2}),
+    ("min_order_alert", {"amount": "15", "currency": "€"}),
+    ("delivery_cost", {"fee": "15", "threshold": "75", "currency": "€"}),
+]
+
+
+def legacy_get_text(key: str, lang: str = DEFAULT_LANGUAGE, **kwargs) -> str:
+    """get_text as it was before the catalog"""
+    if key not in TEXTS:
+        return f"[Missing: {key}]"
+
+    translations = TEXTS[key]
+
+    if lang not in translations:
+        lang = DEFAULT_LANGUAGE
+
+    text = translations.get(lang, translations.get(DEFAULT_LANGUAGE, f"[Missing: {key}]"))
+
+    if kwargs:
+        try:
+            text = text.format(**kwargs)
+        except KeyError:
+            pass
+
+    return text
+
+
+def measure(fn, langs: list[str], renders: int) -> float:
+    """Calls per second"""
+    start = time.perf_counter()
+    for i in range(renders):
+        lang = langs[i % len(langs)]
+        for key, kwargs in CALLS:
+            fn(key, lang, **kwargs)
+    return renders * len(CALLS) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--renders", type=int, default=20000)
+    args = parser.parse_args()
+
+    langs = list(LANGUAGES)
+    for key, kwargs in CALLS:
+        for lang in langs:
+            assert get_text(key, lang, **kwargs) == legacy_get_text(key, lang, **kwargs), key
+
+    legacy = measure(legacy_get_text, langs, args.renders)
+    compiled = measure(get_text, langs, args.renders)
+
+    print(f"{len(CALLS)} get_text calls per render, {args.renders} renders")
+    print(f"{'legacy':10} {legacy / 1e6:>8.2f} M calls/s")
+    print(f"{'compiled':10} {compiled / 1e6:>8.2f} M calls/s")
+    print(f"speedup {compiled / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cost of building keyboards versus serving them cached.
+
+For each language-only keyboard, builds it from scratch (what every
+update did before) and fetches it from the static keyboard cache,
+cycling through all languages. Then does the same for the category
+list and for an item list with a few items in the cart, where only
+the cart badges are built per call.
+
+Usage:
+    python benchmarks/keyboard_bench.py [--rounds 5000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.i18n import LANGUAGES
+from app.keyboards.cart_kb import get_empty_cart_keyboard
+from app.keyboards.menu_kb import (
+    _build_categories_keyboard,
+    get_categories_keyboard,
+    get_items_keyboard,
+    get_language_keyboard,
+    get_main_menu_keyboard,
+    menu_keyboards,
+)
+from app.keyboards.order_kb import (
+    get_confirm_order_keyboard,
+    get_delivery_type_keyboard,
+    get_order_complete_keyboard,
+    get_skip_comment_keyboard,
+)
+from app.keyboards.static_cache import static_keyboards
+from app.models.cart import Cart
+from app.services.menu_service import MenuService
+
+KEYBOARDS = [
+    get_main_menu_keyboard,
+    get_language_keyboard,
+    get_empty_cart_keyboard,
+    get_delivery_type_keyboard,
+    get_skip_comment_keyboard,
+    get_confirm_order_keyboard,
+    get_order_complete_keyboard,
+]
+
+
+def measure(fn, langs: list[str], rounds: int, takes_lang: bool) -> float:
+    """Microseconds per call"""
+    start = time.perf_counter()
+    for i in range(rounds):
+        if takes_lang:
+            fn(langs[i % len(langs)])
+        else:
+            fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+
+    langs = list(LANGUAGES)
+
+    start = time.perf_counter()
+    static_keyboards.warm_up(langs)
+    warm_up_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{'keyboard':32} {'build us':>10} {'cached us':>10}")
+    built_total = cached_total = 0.0
+    for keyboard in KEYBOARDS:
+        takes_lang = keyboard.build.__code__.co_argcount > 0
+        built = measure(keyboard.build, langs, args.rounds, takes_lang)
+        cached = measure(keyboard, langs, args.rounds, takes_lang)
+        built_total += built
+        cached_total += cached
+        print(f"{keyboard.__name__:32} {built:>10.1f} {cached:>10.2f}")
+
+    print(f"{'mean per update':32} {built_total / len(KEYBOARDS):>10.1f} "
+          f"{cached_total / len(KEYBOARDS):>10.2f}")
+    print(f"warm-up of {len(langs)} languages: {warm_up_ms:.1f} ms")
+
+    menu_path = Path(__file__).parent.parent / "data" / "menu.json"
+    snapshot = MenuService(str(menu_path)).get_snapshot()
+    category = max(snapshot.sorted_categories, key=lambda c: len(c.items))
+    cart = Cart(1, snapshot, "en", {item.id: 2 for item in category.items[:3]})
+
+    def build_items(lang):
+        # Uncached: every row rebuilt, as before
+        menu_keyboards.clear()
+        return get_items_keyboard(snapshot, category, cart, lang)
+
+    print()
+    print(f"{'menu keyboard':32} {'build us':>10} {'cached us':>10}")
+    built = measure(
+        lambda lang: _build_categories_keyboard(snapshot, lang), langs, args.rounds, True
+    )
+    cached = measure(
+        lambda lang: get_categories_keyboard(snapshot, lang), langs, args.rounds, True
+    )
+    print(f"{'categories':32} {built:>10.1f} {cached:>10.2f}")
+    built = measure(build_items, langs, args.rounds, True)
+    cached = measure(
+        lambda lang: get_items_keyboard(snapshot, category, cart, lang), langs, args.rounds, True
+    )
+    print(f"{f'items ({len(category.items)}, 3 in cart)':32} {built:>10.1f} {cached:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
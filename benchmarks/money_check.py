@@ -0,0 +1,146 @@
+"""
+Check that order amounts in cents match exact decimal arithmetic.
+
+Builds random carts from data/menu.json and compares, to the cent,
+the cart total, the order created from it, the amounts written to the
+sheet row and an order journaled in whole euros before the switch to
+cents (as Order.from_journal upgrades it) with the same sums done in
+Decimal euros. Exits with status 1 on the first mismatch.
+
+Usage:
+    python benchmarks/money_check.py [--carts 10000] [--seed 1]
+"""
+
+import argparse
+import json
+import random
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.cart import Cart
+from app.models.money import format_money, to_cents
+from app.models.order import DeliveryType, Order
+from app.services.menu_service import MenuService
+from app.services.sheets_service import GoogleSheetsService
+
+# Sheet columns holding amounts, as in GoogleSheetsService.HEADERS
+AMOUNT_COLUMNS = ("subtotal", "delivery_fee", "total")
+
+
+def fail(message: str) -> None:
+    sys.exit(f"MISMATCH: {message}")
+
+
+def euros(value: str) -> Decimal:
+    """Amount as written in a sheet cell"""
+    return Decimal(value)
+
+
+def legacy_payload(order: Order, prices: dict[str, Decimal], fee: Decimal) -> str:
+    """Journal entry of the same order as it was written in euros"""
+    data = order.model_dump(mode="json", exclude={"amounts_in_cents"})
+    for item in data["items"]:
+        price = prices[item["item_id"]]
+        item["price"] = float(price)
+        item["subtotal"] = float(price * item["quantity"])
+    subtotal = sum(Decimal(str(item["subtotal"])) for item in data["items"])
+    data["subtotal"] = float(subtotal)
+    data["delivery_fee"] = float(fee)
+    data["total"] = float(subtotal + fee)
+    return json.dumps(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check cent arithmetic of orders")
+    parser.add_argument("--carts", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    menu_path = Path(__file__).parent.parent / "data" / "menu.json"
+    raw_menu = json.loads(menu_path.read_text(encoding="utf-8"))
+    # Prices exactly as written in menu.json
+    prices = {
+        item["id"]: Decimal(str(item["price"]))
+        for category in raw_menu["categories"]
+        for item in category["items"]
+    }
+    snapshot = MenuService(str(menu_path)).get_snapshot()
+    items = [item for category in snapshot.sorted_categories for item in category.items]
+    sheets = GoogleSheetsService(credentials_path="", spreadsheet_id="")
+    fee_euros = Decimal("15")
+    fee = to_cents(fee_euros)
+
+    for item in items:
+        if Decimal(item.price) != prices[item.id] * 100:
+            fail(f"{item.id}: {prices[item.id]} parsed as {item.price} cents")
+        if euros(format_money(item.price)) != prices[item.id]:
+            fail(f"{item.id}: {item.price} cents shown as {format_money(item.price)}")
+
+    rng = random.Random(args.seed)
+    for number in range(args.carts):
+        quantities = {
+            item.id: rng.randint(1, 99)
+            for item in rng.sample(items, rng.randint(1, min(8, len(items))))
+        }
+        cart = Cart(1, snapshot, "en", quantities)
+        # Taps on +/- along the way must not drift the running total
+        for _ in range(rng.randint(0, 20)):
+            item_id = rng.choice(list(quantities))
+            if rng.random() < 0.5:
+                cart.increment_item(item_id)
+            else:
+                cart.decrement_item(item_id)
+            if item_id not in cart.items:
+                cart.add_item(item_id, rng.randint(1, 5))
+
+        exact = sum(prices[item_id] * line.quantity for item_id, line in cart.items.items())
+        if Decimal(cart.total) != exact * 100:
+            fail(f"cart {number}: total {cart.total} cents, expected {exact}")
+
+        delivery_type = rng.choice(list(DeliveryType))
+        order_fee = fee if delivery_type == DeliveryType.DELIVERY else 0
+        exact_fee = fee_euros if order_fee else Decimal(0)
+        order = Order.from_cart(
+            order_id=f"ORD-CHECK-{number:05d}",
+            user_id=1,
+            username=None,
+            customer_name="Check",
+            customer_phone="+33600000000",
+            delivery_type=delivery_type,
+            delivery_address="1 rue de la Paix" if order_fee else None,
+            delivery_time="asap",
+            cart_items=cart.items,
+            delivery_fee=order_fee,
+        )
+        expected = {
+            "subtotal": exact,
+            "delivery_fee": exact_fee,
+            "total": exact + exact_fee,
+        }
+        for key, value in expected.items():
+            if Decimal(getattr(order, key)) != value * 100:
+                fail(f"order {number}: {key} {getattr(order, key)} cents, expected {value}")
+
+        row = dict(zip(sheets.HEADERS, sheets._format_row(order)))
+        for key in AMOUNT_COLUMNS:
+            if euros(row[key]) != expected[key]:
+                fail(f"order {number}: sheet {key} {row[key]!r}, expected {expected[key]}")
+
+        upgraded = Order.from_journal(legacy_payload(order, prices, exact_fee))
+        for key in AMOUNT_COLUMNS:
+            if getattr(upgraded, key) != getattr(order, key):
+                fail(
+                    f"order {number}: legacy journal {key} {getattr(upgraded, key)} cents, "
+                    f"expected {getattr(order, key)}"
+                )
+        if [item.subtotal for item in upgraded.items] != [item.subtotal for item in order.items]:
+            fail(f"order {number}: legacy journal item subtotals differ")
+
+    print(f"OK: {len(items)} menu prices and {args.carts} orders match to the cent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Load-test GoogleSheetsService against a local fake of the Sheets API.
+
+Usage:
+    python benchmarks/sheets_bench.py [--rate 10] [--duration 20]
+                                      [--latency 0.15] [--error-rate 0.02]
+                                      [--quota 60] [--ops save,next_id,status]
+
+Every 1/rate seconds a simulated checkout starts: it asks for the next
+order ID, saves the order and, for --status-share of orders, changes its
+status. Latency percentiles are reported per operation together with
+the number of API requests each order cost.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_sheets import FakeSheetsBackend, FakeSheetsService
+
+from app.models.order import DeliveryType, Order, OrderItem, OrderStatus
+from app.services.metrics_service import metrics
+
+OPERATIONS = ("save", "next_id", "status")
+
+
+def make_order(order_id: str) -> Order:
+    now = datetime.now()
+    item = OrderItem(item_id="set_002", name="GUNKAN", price=1500, quantity=2, subtotal=3000)
+    return Order(
+        order_id=order_id,
+        user_id=random.randint(1, 10**6),
+        customer_name="Bench",
+        customer_phone="+33600000000",
+        delivery_type=DeliveryType.PICKUP,
+        delivery_time="asap",
+        items=[item],
+        subtotal=3000,
+        total=3000,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+async def timed(name: str, coro) -> object:
+    start = time.perf_counter()
+    result = await coro
+    metrics.observe(f"bench.{name}", time.perf_counter() - start)
+    if result is False:
+        metrics.increment(f"bench.{name}.failed")
+    return result
+
+
+async def checkout(service: FakeSheetsService, number: int, ops: set[str], status_share: float):
+    if "next_id" in ops:
+        order_id = await timed("next_id", service.get_next_order_id())
+    else:
+        order_id = f"ORD-{datetime.now():%Y%m%d}-{number:05d}"
+    if "save" in ops:
+        await timed("save", service.save_order(make_order(order_id)))
+    if "status" in ops and random.random() < status_share:
+        await timed("status", service.update_order_status(order_id, OrderStatus.CONFIRMED))
+
+
+async def run(args: argparse.Namespace) -> None:
+    backend = FakeSheetsBackend(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        quota_per_minute=args.quota,
+        seed=1,
+    )
+    service = FakeSheetsService(
+        backend,
+        batch_window=args.batch_window,
+        batch_size=args.batch_size,
+        requests_per_minute=args.rpm,
+    )
+    ops = set(args.ops.split(","))
+    total = int(args.rate * args.duration)
+
+    start = time.perf_counter()
+    tasks = []
+    for number in range(1, total + 1):
+        tasks.append(asyncio.create_task(checkout(service, number, ops, args.status_share)))
+        # Open loop: keep the arrival rate regardless of how slow calls are
+        await asyncio.sleep(max(0.0, start + number / args.rate - time.perf_counter()))
+    await asyncio.gather(*tasks)
+    await service.close()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{total} checkouts at {args.rate}/s, latency {args.latency * 1000:.0f}ms, "
+        f"errors {args.error_rate:.0%}, quota {args.quota or '-'}/min"
+    )
+    print(f"{'operation':<10}{'count':>7}{'failed':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name in OPERATIONS:
+        histogram = metrics.histograms.get(f"bench.{name}")
+        if histogram is None:
+            continue
+        summary = histogram.summary()
+        print(
+            f"{name:<10}{summary['count']:>7}{metrics.counters[f'bench.{name}.failed']:>8}"
+            + "".join(f"{summary[p] * 1000:>7.0f}ms" for p in ("p50", "p95", "p99", "max"))
+        )
+
+    saved = metrics.counters["sheets.orders_saved"]
+    calls = sum(backend.calls.values())
+    print(f"throughput: {total / elapsed:.1f} checkouts/s, {saved / elapsed:.1f} saved orders/s")
+    print(
+        f"API requests: {calls} ({calls / max(saved, 1):.2f} per saved order) "
+        + ", ".join(f"{name}={count}" for name, count in sorted(backend.calls.items()))
+    )
+    for name in ("throttled", "rate_limited", "breaker_opened", "breaker_rejected"):
+        if metrics.counters[f"sheets.{name}"]:
+            print(f"sheets.{name}: {metrics.counters[f'sheets.{name}']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark GoogleSheetsService")
+    parser.add_argument("--rate", type=float, default=10, help="checkouts per second")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per API call")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--quota", type=int, default=None, help="fake API requests/min")
+    parser.add_argument("--rpm", type=int, default=60, help="client-side limit, requests/min")
+    parser.add_argument("--batch-window", type=float, default=0.5)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--status-share", type=float, default=0.2)
+    parser.add_argument("--ops", default=",".join(OPERATIONS))
+    args = parser.parse_args()
+
+    # Service logging would drown the report
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
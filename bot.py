@@ -8,14 +8,35 @@ sys.path.insert(0, str(Path(__file__).parent))
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
 from loguru import logger
 
-from config import settings
+from config import settings, BotMode, StorageBackend
 from app.handlers import common, menu, cart, order
+from app.i18n import CATALOG, LANGUAGES
+from app.keyboards.menu_kb import menu_keyboards
+from app.keyboards.static_cache import static_keyboards
+from app.middlewares import (
+    CallbackAckRequestMiddleware,
+    CallbackAcks,
+    EarlyCallbackAnswerMiddleware,
+    PrefetchFSMContextMiddleware,
+    SkipUnchangedEditsMiddleware,
+    StateBufferMiddleware,
+    SupersededEditsMiddleware,
+)
 from app.services.menu_service import MenuService
 from app.services.sheets_service import GoogleSheetsService
 from app.services.notification_service import NotificationService
+from app.services.image_cache_service import ImageCacheService
+from app.services.image_optimizer_service import ImageOptimizerService
+from app.services.order_outbox_service import OrderOutbox
+from app.services.order_id_service import OrderIdAllocator
+from app.services.render_cache import item_texts
+from app.services.edit_coalescer import EditCoalescer
+from app.services.render_fingerprint import RenderFingerprints
+from app.storage import SqliteStorage
+from app.webhook import run_webhook
 
 
 async def main():
@@ -34,26 +55,76 @@ async def main():
 
     logger.info(f"Starting bot in {settings.environment} mode")
 
-    # Initialize storage
-    storage = MemoryStorage()
-    logger.info("Using Memory storage")
+    # Initialize storage. Updates of one user are processed one at a
+    # time, since the state buffer writes FSM data back at the end.
+    events_isolation = SimpleEventIsolation()
+    if settings.fsm_storage == StorageBackend.REDIS:
+        from app.storage.redis_storage import SharedRedisStorage
+
+        storage = SharedRedisStorage.from_settings(
+            url=settings.redis_url,
+            prefix=settings.fsm_key_prefix,
+            session_ttl=settings.fsm_session_ttl,
+            max_connections=settings.redis_max_connections,
+        )
+        # Serialize updates of the same user across all workers
+        events_isolation = storage.create_isolation()
+        logger.info("Using Redis storage")
+    elif settings.fsm_storage == StorageBackend.SQLITE:
+        storage = SqliteStorage(
+            path=settings.fsm_sqlite_path,
+            flush_interval=settings.fsm_flush_interval,
+            cache_size=settings.fsm_cache_size,
+        )
+        logger.info(f"Using SQLite storage: {settings.fsm_sqlite_path}")
+    else:
+        storage = MemoryStorage()
+        logger.info("Using Memory storage")
 
     # Initialize bot and dispatcher
     bot = Bot(
         token=settings.bot_token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
-    dp = Dispatcher(storage=storage)
+    # aiogram's FSM middleware is replaced by one that reads state and
+    # data in a single round trip where the storage allows it
+    dp = Dispatcher(storage=storage, events_isolation=events_isolation, disable_fsm=True)
+    dp.update.outer_middleware(
+        PrefetchFSMContextMiddleware(storage=storage, events_isolation=events_isolation)
+    )
+    # Read FSM data once per update, after the FSM middleware
+    dp.update.outer_middleware(StateBufferMiddleware())
 
     # Initialize services
     menu_service = MenuService(settings.menu_file_path)
     sheets_service = GoogleSheetsService(
         credentials_path=settings.google_credentials_path,
         spreadsheet_id=settings.google_spreadsheet_id,
+        batch_window=settings.sheets_batch_window,
+        batch_size=settings.sheets_batch_size,
+        requests_per_minute=settings.sheets_requests_per_minute,
+        call_timeout=settings.sheets_call_timeout,
+        breaker_threshold=settings.sheets_breaker_threshold,
+        breaker_reset=settings.sheets_breaker_reset,
     )
     notification_service = NotificationService(
         bot=bot,
         channel_id=settings.orders_channel_id,
+        messages_per_minute=settings.channel_messages_per_minute,
+    )
+    order_outbox = OrderOutbox(settings.orders_db_path)
+    if sheets_service.is_enabled:
+        order_outbox.register_sink("sheets", sheets_service.save_order)
+    if notification_service.is_enabled:
+        order_outbox.register_sink(
+            "channel", notification_service.deliver_order_notification
+        )
+    order_ids = OrderIdAllocator(settings.orders_db_path)
+    image_cache = ImageCacheService(settings.image_cache_path)
+    image_optimizer = ImageOptimizerService(
+        cache_dir=settings.image_variants_dir,
+        max_side=settings.image_max_side,
+        quality=settings.image_quality,
     )
 
     # Load menu to verify it works
@@ -67,6 +138,75 @@ async def main():
         logger.error(f"Failed to load menu: {e}")
         return
 
+    for problem in CATALOG.validate():
+        logger.warning(f"Translations: {problem}")
+
+    # Language-only keyboards are built once and then shared
+    static_keyboards.warm_up(LANGUAGES)
+
+    # Continue today's order numbers after the ones already in the sheet,
+    # in case the local database is new (e.g. fresh deploy)
+    if sheets_service.is_enabled:
+        today = OrderIdAllocator.today()
+        last = await sheets_service.get_last_order_number(today)
+        if last is not None:
+            await order_ids.seed(today, last)
+
+    # Deliver queued orders, including ones left from a previous run
+    await order_outbox.start()
+
+    # Hot-reload menu when data/menu.json changes
+    menu_watcher = None
+    if settings.menu_reload_interval > 0:
+        menu_watcher = asyncio.create_task(
+            menu_service.watch(settings.menu_reload_interval)
+        )
+
+    # Build optimized images, then pre-upload them so first views are
+    # served by file_id. Originals are sent until the build finishes.
+    async def prepare_images():
+        paths = menu_service.get_snapshot().get_image_paths()
+        await image_optimizer.build_async(paths)
+        if settings.image_warmup_chat_id:
+            await image_cache.warm_up(
+                bot,
+                settings.image_warmup_chat_id,
+                [image_optimizer.get_variant(path) for path in paths],
+            )
+
+    images_task = asyncio.create_task(prepare_images())
+    menu_service.add_reload_listener(
+        lambda index: image_optimizer.schedule_build(index.get_image_paths())
+    )
+    menu_service.add_reload_listener(
+        lambda index: static_keyboards.rebuild(LANGUAGES)
+    )
+    menu_service.add_reload_listener(menu_keyboards.invalidate)
+    menu_service.add_reload_listener(item_texts.invalidate)
+
+    # Remember what bot messages show, so identical edits are skipped.
+    # This memory is per process, so it stays off when several workers
+    # share a Redis storage and may edit the same message.
+    fingerprints = None
+    if settings.skip_unchanged_edits and settings.fsm_storage != StorageBackend.REDIS:
+        fingerprints = RenderFingerprints()
+
+    # Registered first, so even edits skipped as unchanged drop stale
+    # coalesced ones
+    edit_coalescer = EditCoalescer(fingerprints, window=settings.quantity_edit_window)
+    bot.session.middleware(SupersededEditsMiddleware(edit_coalescer))
+    if fingerprints is not None:
+        bot.session.middleware(SkipUnchangedEditsMiddleware(fingerprints))
+
+    if settings.early_callback_answer:
+        callback_acks = CallbackAcks()
+        dp.callback_query.middleware(
+            EarlyCallbackAnswerMiddleware(
+                callback_acks, delay=settings.early_callback_answer_delay
+            )
+        )
+        bot.session.middleware(CallbackAckRequestMiddleware(callback_acks))
+
     # Include routers
     dp.include_router(common.router)
     dp.include_router(menu.router)
@@ -79,6 +219,11 @@ async def main():
         data["menu_service"] = menu_service
         data["sheets_service"] = sheets_service
         data["notification_service"] = notification_service
+        data["order_outbox"] = order_outbox
+        data["order_ids"] = order_ids
+        data["image_cache"] = image_cache
+        data["image_optimizer"] = image_optimizer
+        data["edit_coalescer"] = edit_coalescer
         data["settings"] = settings
         return await handler(event, data)
 
@@ -86,19 +231,33 @@ async def main():
     logger.info("Bot starting...")
 
     try:
-        # Polling mode for development
-        await bot.delete_webhook(drop_pending_updates=True)
-        logger.info("Starting polling...")
+        if settings.bot_mode == BotMode.WEBHOOK:
+            # Get bot info
+            bot_info = await bot.get_me()
+            logger.info(f"Bot: @{bot_info.username} ({bot_info.first_name})")
+
+            await run_webhook(dp, bot, settings)
+        else:
+            # Polling mode for development
+            await bot.delete_webhook(drop_pending_updates=True)
+            logger.info("Starting polling...")
 
-        # Get bot info
-        bot_info = await bot.get_me()
-        logger.info(f"Bot: @{bot_info.username} ({bot_info.first_name})")
+            # Get bot info
+            bot_info = await bot.get_me()
+            logger.info(f"Bot: @{bot_info.username} ({bot_info.first_name})")
 
-        await dp.start_polling(bot)
+            await dp.start_polling(bot)
 
     except Exception as e:
         logger.error(f"Bot error: {e}")
     finally:
+        if menu_watcher:
+            menu_watcher.cancel()
+        images_task.cancel()
+        await edit_coalescer.close()
+        await order_outbox.stop()
+        await sheets_service.close()
+        await order_ids.close()
         await bot.session.close()
         logger.info("Bot stopped")
 
@@ -1,14 +1,27 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import AliasChoices, Field
 from typing import Optional
 from enum import Enum
 
+from app.models.money import Money
+
 
 class Environment(str, Enum):
     DEVELOPMENT = "development"
     PRODUCTION = "production"
 
 
+class BotMode(str, Enum):
+    POLLING = "polling"
+    WEBHOOK = "webhook"
+
+
+class StorageBackend(str, Enum):
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+    REDIS = "redis"
+
+
 class Settings(BaseSettings):
     """Application configuration using pydantic-settings"""
 
@@ -26,6 +39,40 @@ class Settings(BaseSettings):
     # Telegram Bot
     bot_token: str = Field(..., validation_alias="BOT_TOKEN")
 
+    # Update delivery
+    bot_mode: BotMode = BotMode.POLLING
+    # Public HTTPS address of the service (Render sets RENDER_EXTERNAL_URL)
+    webhook_base_url: str = Field(
+        "", validation_alias=AliasChoices("WEBHOOK_BASE_URL", "RENDER_EXTERNAL_URL")
+    )
+    webhook_path: str = "/webhook"
+    # Derived from the bot token when empty
+    webhook_secret: str = Field("", validation_alias="WEBHOOK_SECRET")
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = Field(8080, validation_alias=AliasChoices("WEBHOOK_PORT", "PORT"))
+    # Updates processed at the same time by one worker
+    webhook_max_concurrency: int = 40
+    # Seconds to let in-flight updates finish on SIGTERM
+    webhook_drain_timeout: float = 25.0
+    health_path: str = "/health"
+    metrics_path: str = "/metrics"
+
+    # FSM storage
+    fsm_storage: StorageBackend = StorageBackend.MEMORY
+    fsm_sqlite_path: str = "data/fsm.sqlite3"
+    # Max seconds a state change waits before it is committed to disk
+    fsm_flush_interval: float = 0.05
+    # Number of users whose state is kept in memory
+    fsm_cache_size: int = 10000
+    # Redis backend, shared by all bot workers
+    redis_url: str = Field(
+        "redis://localhost:6379/0", validation_alias="REDIS_URL"
+    )
+    redis_max_connections: int = 20
+    fsm_key_prefix: str = "sushi_fsm"
+    # Seconds of inactivity after which a session expires (0 keeps forever)
+    fsm_session_ttl: int = 30 * 24 * 3600
+
     # Google Sheets
     google_credentials_path: str = Field(
         "credentials/service_account.json",
@@ -34,19 +81,57 @@ class Settings(BaseSettings):
     google_spreadsheet_id: str = Field(
         "", validation_alias="GOOGLE_SPREADSHEET_ID"
     )
+    # Orders are appended in batches: a batch is written after this many
+    # seconds or as soon as it has sheets_batch_size rows
+    sheets_batch_window: float = 0.5
+    sheets_batch_size: int = 50
+    # Google Sheets API write quota per minute; requests are paced to it
+    sheets_requests_per_minute: int = 60
+    # Seconds one Sheets operation's requests may spend with Google before
+    # it counts as failed (waiting for the request quota is not counted)
+    sheets_call_timeout: float = 15.0
+    # Consecutive failures after which Sheets calls are skipped
+    # for sheets_breaker_reset seconds
+    sheets_breaker_threshold: int = 5
+    sheets_breaker_reset: float = 30.0
 
     # Menu
     menu_file_path: str = "data/menu.json"
+    # Seconds between menu file checks for hot reload (0 disables)
+    menu_reload_interval: float = 5.0
+    # The first quantity tap is shown at once; taps within this many
+    # seconds after an edit are sent together as the next one
+    quantity_edit_window: float = 0.3
+    # Skip message edits that would show exactly what is already shown
+    # (always off with Redis storage, where several workers edit messages)
+    skip_unchanged_edits: bool = True
+    # Answer callback queries while handlers still run, so the client
+    # spinner stops at once; the delay is in seconds
+    early_callback_answer: bool = True
+    early_callback_answer_delay: float = 0.0
+    # Optimized copies of menu images sent instead of the originals
+    image_variants_dir: str = "data/cache/images"
+    image_max_side: int = 1024
+    image_quality: int = 80
+    # Telegram file_ids of uploaded menu images
+    image_cache_path: str = "data/cache/file_ids.json"
+    # Private chat to pre-upload menu images to at startup (empty disables)
+    image_warmup_chat_id: str = Field("", validation_alias="IMAGE_WARMUP_CHAT_ID")
+
+    # Local journal of confirmed orders awaiting delivery to sheets/channel
+    orders_db_path: str = "data/orders.sqlite3"
 
     # Notifications - Telegram channel for orders
     orders_channel_id: str = Field(
         "", validation_alias="ORDERS_CHANNEL_ID"
     )
+    # Telegram allows about 20 messages per minute to one group/channel
+    channel_messages_per_minute: int = 20
 
-    # Business settings (in euros)
-    min_order_amount: int = 15
-    delivery_fee: int = 15
-    free_delivery_threshold: int = 75
+    # Business settings: given in euros, held as integer cents
+    min_order_amount: Money = Field(15, validate_default=True)
+    delivery_fee: Money = Field(15, validate_default=True)
+    free_delivery_threshold: Money = Field(75, validate_default=True)
 
 
 # Singleton instance